@@ -49,7 +49,11 @@ async def close_mongo_connection():
 
 
 async def get_database():
-    """Get database instance"""
+    """
+    Get database instance.
+    Routes take it as `db=Depends(get_database)`; it stays `async def` because FastAPI
+    runs sync dependencies in the threadpool, while async ones are awaited inline.
+    """
     return database
 
 
@@ -71,6 +75,8 @@ async def create_indexes():
     await properties_collection.create_index([("bedrooms", 1), ("bathrooms", 1)])
     await properties_collection.create_index([("owner_id", 1)])
     await properties_collection.create_index([("posted_at", -1)])
+    # Owner listings sorted newest first (My Listings, GET /owner/{id})
+    await properties_collection.create_index([("owner_id", 1), ("posted_at", -1)])
     
     # Users collection indexes
     users_collection = db.users
@@ -127,16 +133,39 @@ async def create_indexes():
         print(f"❌ Error creating phone index: {e}")
         raise
     
+    # Admin user list filtered by type, and agent search, sorted newest first
+    await users_collection.create_index([("user_type", 1), ("created_at", -1), ("_id", -1)])
+    await users_collection.create_index([("is_real_estate_agent", 1), ("created_at", -1), ("_id", -1)])
+    
+    # Search Agents: text index over agent location fields (GET /api/users/agents/search).
+    # default_language "none" keeps place names unstemmed and stop-word free.
+    await users_collection.create_index(
+        [
+            ("city", "text"),
+            ("address", "text"),
+            ("locality", "text"),
+            ("dealing_in", "text"),
+            ("location.city", "text"),
+            ("location.locality", "text"),
+        ],
+        name="agent_search_text",
+        default_language="none",
+    )
+    
     # Reviews collection indexes
     reviews_collection = db.reviews
     await reviews_collection.create_index([("property_id", 1)])
     await reviews_collection.create_index([("user_id", 1)])
+    await reviews_collection.create_index([("property_id", 1), ("created_at", -1)])
+    await reviews_collection.create_index([("user_id", 1), ("created_at", -1)])
     
     # Inquiries collection indexes
     inquiries_collection = db.inquiries
     await inquiries_collection.create_index([("property_id", 1)])
     await inquiries_collection.create_index([("user_id", 1)])
     await inquiries_collection.create_index([("created_at", -1)])
+    await inquiries_collection.create_index([("property_id", 1), ("created_at", -1)])
+    await inquiries_collection.create_index([("user_id", 1), ("created_at", -1)])
     
     # Favorites collection indexes
     favorites_collection = db.favorites
@@ -154,6 +183,7 @@ async def create_indexes():
         else:
             raise
     await favorites_collection.create_index([("user_id", 1)])
+    await favorites_collection.create_index([("user_id", 1), ("created_at", -1)])
     
     # Transactions collection indexes
     transactions_collection = db.transactions
@@ -161,45 +191,60 @@ async def create_indexes():
     await transactions_collection.create_index([("buyer_id", 1)])
     await transactions_collection.create_index([("seller_id", 1)])
     await transactions_collection.create_index([("created_at", -1)])
+    await transactions_collection.create_index([("created_at", -1), ("_id", -1)])
+    # Filtered lists sorted newest first (GET /api/transactions)
+    await transactions_collection.create_index([("property_id", 1), ("created_at", -1), ("_id", -1)])
+    await transactions_collection.create_index([("buyer_id", 1), ("created_at", -1), ("_id", -1)])
+    await transactions_collection.create_index([("seller_id", 1), ("created_at", -1), ("_id", -1)])
+    await transactions_collection.create_index([("status", 1), ("created_at", -1), ("_id", -1)])
     
     # OTPs collection indexes
     otps_collection = db.otps
     await otps_collection.create_index([("phone_number", 1)])
     await otps_collection.create_index([("expires_at", 1)], expireAfterSeconds=0)  # TTL index to auto-delete expired OTPs
+    # Per-phone OTP send counters (one row per rate-limit window)
+    await db.otp_send_counts.create_index([("expires_at", 1)], expireAfterSeconds=0)
 
     # Notifications collection indexes (Notification Screen)
     notifications_collection = db.notifications
     await notifications_collection.create_index([("user_id", 1)])
     await notifications_collection.create_index([("user_id", 1), ("read", 1)])
     await notifications_collection.create_index([("created_at", -1)])
+    await notifications_collection.create_index([("user_id", 1), ("created_at", -1)])
 
     # Orders collection indexes (Order History Screen)
     orders_collection = db.orders
     await orders_collection.create_index([("user_id", 1)])
     await orders_collection.create_index([("user_id", 1), ("status", 1)])
     await orders_collection.create_index([("created_at", -1)])
+    await orders_collection.create_index([("user_id", 1), ("created_at", -1)])
+    await orders_collection.create_index([("user_id", 1), ("status", 1), ("created_at", -1)])
 
     # Home Loan applications (Home Loan Screen)
     home_loan_collection = db.home_loan_applications
     await home_loan_collection.create_index([("user_id", 1)])
     await home_loan_collection.create_index([("created_at", -1)])
     await home_loan_collection.create_index([("email", 1)])
+    await home_loan_collection.create_index([("user_id", 1), ("created_at", -1)])
 
     # Property Cost calculations (Property Cost Screen)
     property_cost_collection = db.property_cost_calculations
     await property_cost_collection.create_index([("user_id", 1)])
     await property_cost_collection.create_index([("created_at", -1)])
+    await property_cost_collection.create_index([("user_id", 1), ("created_at", -1), ("_id", -1)])
 
     # NRI queries (NRI Center Screen)
     nri_queries_collection = db.nri_queries
     await nri_queries_collection.create_index([("user_id", 1)])
     await nri_queries_collection.create_index([("created_at", -1)])
     await nri_queries_collection.create_index([("email", 1)])
+    await nri_queries_collection.create_index([("user_id", 1), ("created_at", -1)])
 
     # Post Your Requirement (Requirement Screen)
     requirements_collection = db.requirements
     await requirements_collection.create_index([("user_id", 1)])
     await requirements_collection.create_index([("created_at", -1)])
+    await requirements_collection.create_index([("user_id", 1), ("created_at", -1), ("_id", -1)])
 
     print("✅ All indexes created successfully")
 
@@ -0,0 +1,23 @@
+"""
+ObjectId parsing for IDs coming from paths, query strings and request bodies.
+"""
+from typing import Any
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+
+def parse_object_id(value: Any, name: str) -> ObjectId:
+    """
+    Return ObjectId(value), or raise 400 "Invalid {name} ID".
+    One C-level bytes.fromhex call validates and decodes; ObjectId(bytes) then wraps the
+    12 raw bytes instead of re-parsing the hex string as is_valid() + ObjectId(str) do.
+    """
+    try:
+        raw = bytes.fromhex(value)
+    except (TypeError, ValueError):
+        raw = b""
+    # fromhex skips whitespace, so check both lengths to accept only 24 hex digits
+    if len(raw) != 12 or len(value) != 24:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} ID")
+    return ObjectId(raw)
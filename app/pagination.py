@@ -0,0 +1,52 @@
+"""
+Keyset (cursor) pagination for newest-first lists sorted by (created_at, _id).
+
+Clients pass back ?after=<created_at ISO>&after_id=<_id> from the previous page's
+next_cursor instead of a page number, so Mongo seeks via the index rather than
+walking and discarding skip() documents. page/limit stays supported as the legacy path.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+NEWEST_FIRST = [("created_at", -1), ("_id", -1)]
+
+
+def keyset_filter(after: Optional[datetime], after_id: Optional[str]) -> Optional[dict]:
+    """Query fragment selecting documents strictly after the cursor, or None for the first page."""
+    if after is None:
+        return None
+    if not after_id:
+        return {"created_at": {"$lt": after}}
+    if not ObjectId.is_valid(after_id):
+        raise HTTPException(status_code=400, detail="Invalid after_id")
+    return {
+        "$or": [
+            {"created_at": {"$lt": after}},
+            {"created_at": after, "_id": {"$lt": ObjectId(after_id)}},
+        ]
+    }
+
+
+def next_cursor(items: List[Dict[str, Any]], limit: int) -> Optional[Dict[str, str]]:
+    """Cursor for the page after *items*; None when this was the last page."""
+    if len(items) < limit:
+        return None
+    last = items[-1]
+    created_at = last.get("created_at")
+    if not isinstance(created_at, datetime):
+        return None
+    return {"after": created_at.isoformat(), "after_id": str(last["_id"])}
+
+
+def page_flags(page: int, limit: int, total: int, keyset: Optional[dict], cursor: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    """
+    total_pages / has_next / has_prev for a list response. A cursor request ignores page,
+    so it takes has_next from next_cursor and always has a previous page.
+    """
+    total_pages = -(-total // limit)
+    if keyset:
+        return {"total_pages": total_pages, "has_next": cursor is not None, "has_prev": True}
+    return {"total_pages": total_pages, "has_next": page < total_pages, "has_prev": page > 1}
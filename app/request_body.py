@@ -0,0 +1,37 @@
+"""
+JSON request bodies parsed and validated in one pydantic-core pass.
+
+FastAPI reads a body param with json.loads and then validates the resulting dict;
+model_validate_json goes straight from the raw bytes to the model. Use
+Depends(json_body(Model)) for large bodies, with openapi_extra=json_body_openapi(Model)
+on the route so the docs still show the request schema.
+"""
+from typing import Any, Callable, Dict, Type
+
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+
+def json_body(model: Type[BaseModel]) -> Callable:
+    """Dependency returning *model* validated from the raw request body (422 on error, as FastAPI)."""
+    async def dependency(request: Request) -> BaseModel:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in exc.errors()]
+            )
+    return dependency
+
+
+def json_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """openapi_extra documenting *model* as the JSON request body (nested models resolve to components)."""
+    schema = model.model_json_schema(ref_template="#/components/schemas/{model}")
+    schema.pop("$defs", None)
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}},
+        }
+    }
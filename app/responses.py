@@ -0,0 +1,34 @@
+"""
+JSON response for raw Mongo documents.
+
+Handlers that return this directly skip the per-document ObjectId → str loops and the
+response_model re-validation pass: orjson serializes datetimes natively and calls
+_default only for ObjectId values, all in one native pass. Keep response_model on the
+route for the OpenAPI schema and shape the documents with a find() projection instead.
+"""
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class MongoJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def model_json_response(model: BaseModel) -> Response:
+    """
+    JSON body of an already-validated model, written by pydantic-core (by alias, as
+    response_model would). Skips FastAPI's dump / re-validate / encode round trip.
+    """
+    return Response(model.model_dump_json(by_alias=True), media_type="application/json")
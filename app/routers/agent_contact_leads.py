@@ -2,30 +2,28 @@
 Public lead form: Contact Agent from Search Agent page.
 Stores inquiries with agent reference, contact details, and consent.
 """
-from fastapi import APIRouter, HTTPException
-from bson import ObjectId
+from fastapi import APIRouter, HTTPException, Depends
 from datetime import datetime
 from app.schemas import AgentContactLead, AgentContactLeadCreate
 from app.database import get_database
+from app.object_ids import parse_object_id
 
 router = APIRouter()
 
 
 @router.post("/", response_model=AgentContactLead, status_code=201)
-async def create_agent_contact_lead(data: AgentContactLeadCreate):
+async def create_agent_contact_lead(data: AgentContactLeadCreate, db=Depends(get_database)):
     """
     Submit contact request for an agent (guests allowed; no login required).
     """
     if not data.consent_accepted:
         raise HTTPException(status_code=400, detail="Consent is required to submit")
 
-    db = await get_database()
     agent_oid = None
     if data.agent_id and str(data.agent_id).strip():
         aid = str(data.agent_id).strip()
-        if not ObjectId.is_valid(aid):
-            raise HTTPException(status_code=400, detail="Invalid agent ID")
-        agent_doc = await db.users.find_one({"_id": ObjectId(aid)})
+        agent_oid = parse_object_id(aid, "agent")
+        agent_doc = await db.users.find_one({"_id": agent_oid})
         if not agent_doc:
             raise HTTPException(status_code=404, detail="Agent not found")
         is_agent = agent_doc.get("user_type") == "agent" or agent_doc.get(
@@ -33,7 +31,6 @@ async def create_agent_contact_lead(data: AgentContactLeadCreate):
         ) is True
         if not is_agent:
             raise HTTPException(status_code=400, detail="User is not a registered agent")
-        agent_oid = ObjectId(aid)
 
     doc = {
         "agent_id": agent_oid,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Depends
 from bson import ObjectId
 from datetime import datetime
 from app.schemas.auth import (
@@ -19,25 +19,21 @@ from app.schemas.auth import (
 )
 from app.schemas import User
 from app.services.otp_service import OTPService
+from app.services.passwords import hash_password
+from app.services.user_cache import invalidate_user
 from app.database import get_database
-import hashlib
 import os
 
 router = APIRouter()
 
 
-def hash_password(password: str) -> str:
-    """Simple password hashing (in production, use bcrypt)"""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-
 def _is_apple_review_phone(phone_number: str) -> bool:
     configured = os.getenv("APPLE_REVIEW_PHONE", "").strip()
     return bool(configured) and phone_number.strip() == configured
 
 
 @router.post("/request-otp", response_model=RequestOTPResponse, status_code=status.HTTP_200_OK)
-async def request_otp(request: RequestOTPRequest):
+async def request_otp(request: RequestOTPRequest, background_tasks: BackgroundTasks, db=Depends(get_database)):
     """
     Request OTP for phone number verification
     This is the first step in the signup process
@@ -52,7 +48,6 @@ async def request_otp(request: RequestOTPRequest):
         )
     
     # Check if user already exists
-    db = await get_database()
     existing_user = await db.users.find_one({"phone": phone_number})
     if existing_user:
         raise HTTPException(
@@ -63,8 +58,9 @@ async def request_otp(request: RequestOTPRequest):
     # Generate and send OTP via SMS (signup flow)
     otp = await OTPService.send_otp(phone_number, is_login=False)
     
-    # Store in database (optional, for persistence across server restarts)
-    await OTPService.store_otp_in_db(phone_number, otp)
+    # Store in database (optional, for persistence across server restarts) once the
+    # response is sent; the user can't submit the OTP before the SMS arrives anyway
+    background_tasks.add_task(OTPService.store_otp_in_db, phone_number, otp)
     
     return RequestOTPResponse(
         message="OTP sent successfully to your phone number",
@@ -100,7 +96,7 @@ async def verify_otp(request: VerifyOTPRequest):
 
 
 @router.post("/signup", response_model=SignupResponse, status_code=status.HTTP_201_CREATED)
-async def signup(request: SignupRequest):
+async def signup(request: SignupRequest, db=Depends(get_database)):
     """
     Complete user signup after OTP verification
     This is the final step - saves user data to database
@@ -119,7 +115,6 @@ async def signup(request: SignupRequest):
         )
     
     # Check if user already exists
-    db = await get_database()
     existing_user = await db.users.find_one({"phone": phone_number})
     if existing_user:
         raise HTTPException(
@@ -152,7 +147,7 @@ async def signup(request: SignupRequest):
     # Use email from request if provided, otherwise generate temporary email
     if request.email:
         email = str(request.email).strip()
-        # Basic email validation (EmailStr already validates format, but double-check)
+        # Basic email validation (the Email type already validates format, but double-check)
         if "@" not in email or len(email) < 5:
             email = f"{phone_number}@temp.huntproperty.com"  # Invalid email, use fallback
     else:
@@ -174,7 +169,7 @@ async def signup(request: SignupRequest):
         "email": email,
         "user_type": user_type,
         "created_at": datetime.utcnow(),
-        "password": hash_password(phone_number)  # Default password (user can change later)
+        "password": await hash_password(phone_number)  # Default password (user can change later)
     }
     
     result = await db.users.insert_one(user_dict)
@@ -194,12 +189,11 @@ async def signup(request: SignupRequest):
 
 
 @router.get("/check-phone/{phone_number}", status_code=status.HTTP_200_OK)
-async def check_phone_exists(phone_number: str):
+async def check_phone_exists(phone_number: str, db=Depends(get_database)):
     """
     Check if phone number is already registered
     Useful for login/signup flow
     """
-    db = await get_database()
 
     # For App Store review / QA: treat configured review phone as existing,
     # and auto-provision it if missing so login flow can proceed.
@@ -218,7 +212,7 @@ async def check_phone_exists(phone_number: str):
                 "email": apple_email or f"{phone_number}@temp.huntproperty.com",
                 "user_type": apple_user_type,
                 "created_at": datetime.utcnow(),
-                "password": hash_password(phone_number),
+                "password": await hash_password(phone_number),
             }
             await db.users.insert_one(user_dict)
         return {
@@ -235,7 +229,7 @@ async def check_phone_exists(phone_number: str):
 
 
 @router.post("/login/request-otp", response_model=LoginRequestOTPResponse, status_code=status.HTTP_200_OK)
-async def login_request_otp(request: LoginRequestOTPRequest):
+async def login_request_otp(request: LoginRequestOTPRequest, background_tasks: BackgroundTasks, db=Depends(get_database)):
     """
     Request OTP for login
     Checks if phone number exists in database, then sends OTP
@@ -250,7 +244,6 @@ async def login_request_otp(request: LoginRequestOTPRequest):
         )
     
     # Check if user exists in database
-    db = await get_database()
     existing_user = await db.users.find_one({"phone": phone_number})
     if not existing_user:
         # For App Store review / QA: optionally auto-provision a single static account
@@ -268,7 +261,7 @@ async def login_request_otp(request: LoginRequestOTPRequest):
                 "email": apple_email or f"{phone_number}@temp.huntproperty.com",
                 "user_type": apple_user_type,
                 "created_at": datetime.utcnow(),
-                "password": hash_password(phone_number),
+                "password": await hash_password(phone_number),
             }
             await db.users.insert_one(user_dict)
             existing_user = await db.users.find_one({"phone": phone_number})
@@ -281,8 +274,9 @@ async def login_request_otp(request: LoginRequestOTPRequest):
     # Generate and send OTP via SMS (login flow)
     otp = await OTPService.send_otp(phone_number, is_login=True)
     
-    # Store in database (optional, for persistence across server restarts)
-    await OTPService.store_otp_in_db(phone_number, otp)
+    # Store in database (optional, for persistence across server restarts) once the
+    # response is sent; the user can't submit the OTP before the SMS arrives anyway
+    background_tasks.add_task(OTPService.store_otp_in_db, phone_number, otp)
     
     return LoginRequestOTPResponse(
         message="OTP sent successfully to your phone number",
@@ -291,7 +285,7 @@ async def login_request_otp(request: LoginRequestOTPRequest):
 
 
 @router.post("/login/verify-otp", response_model=LoginVerifyOTPResponse, status_code=status.HTTP_200_OK)
-async def login_verify_otp(request: LoginVerifyOTPRequest):
+async def login_verify_otp(request: LoginVerifyOTPRequest, db=Depends(get_database)):
     """
     Verify OTP and login user
     After OTP verification, returns user data
@@ -311,7 +305,6 @@ async def login_verify_otp(request: LoginVerifyOTPRequest):
         )
     
     # Get user from database
-    db = await get_database()
     user = await db.users.find_one({"phone": phone_number})
     
     if not user:
@@ -340,7 +333,9 @@ async def login_verify_otp(request: LoginVerifyOTPRequest):
     response_model=ProfilePhoneRequestOTPResponse,
     status_code=status.HTTP_200_OK,
 )
-async def profile_phone_request_otp(request: ProfilePhoneRequestOTPRequest):
+async def profile_phone_request_otp(
+    request: ProfilePhoneRequestOTPRequest, background_tasks: BackgroundTasks, db=Depends(get_database)
+):
     """
     Request OTP to attach/verify a phone number for an existing user (profile flow)
     """
@@ -353,8 +348,6 @@ async def profile_phone_request_otp(request: ProfilePhoneRequestOTPRequest):
             detail="Invalid phone number format. Please include country code (e.g., +918881675561)",
         )
 
-    db = await get_database()
-
     # Validate user ID and ensure user exists
     try:
         user_obj_id = ObjectId(user_id)
@@ -380,7 +373,7 @@ async def profile_phone_request_otp(request: ProfilePhoneRequestOTPRequest):
         )
 
     otp = await OTPService.send_otp(phone_number, is_login=False)
-    await OTPService.store_otp_in_db(phone_number, otp)
+    background_tasks.add_task(OTPService.store_otp_in_db, phone_number, otp)
 
     return ProfilePhoneRequestOTPResponse(
         message="OTP sent successfully to your phone number",
@@ -393,7 +386,7 @@ async def profile_phone_request_otp(request: ProfilePhoneRequestOTPRequest):
     response_model=ProfilePhoneVerifyOTPResponse,
     status_code=status.HTTP_200_OK,
 )
-async def profile_phone_verify_otp(request: ProfilePhoneVerifyOTPRequest):
+async def profile_phone_verify_otp(request: ProfilePhoneVerifyOTPRequest, db=Depends(get_database)):
     """
     Verify OTP for profile phone attach and persist phone on user
     """
@@ -412,8 +405,6 @@ async def profile_phone_verify_otp(request: ProfilePhoneVerifyOTPRequest):
             detail="Invalid or expired OTP. Please request a new OTP.",
         )
 
-    db = await get_database()
-
     try:
         user_obj_id = ObjectId(user_id)
     except Exception:
@@ -442,6 +433,7 @@ async def profile_phone_verify_otp(request: ProfilePhoneVerifyOTPRequest):
         {"_id": user_obj_id},
         {"$set": {"phone": phone_number}},
     )
+    invalidate_user(user_id)
 
     # Clear OTP after success
     await OTPService.clear_otp_from_db(phone_number)
@@ -3,7 +3,7 @@ Public lead form: Career Application.
 Stores job applications with applicant details and resume link.
 No authentication required — anyone can apply.
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from datetime import datetime
 from app.schemas import CareerApplication, CareerApplicationCreate
 from app.database import get_database
@@ -12,11 +12,10 @@ router = APIRouter()
 
 
 @router.post("/", response_model=CareerApplication, status_code=201)
-async def create_career_application(data: CareerApplicationCreate):
+async def create_career_application(data: CareerApplicationCreate, db=Depends(get_database)):
     """
     Submit a career application (public — no login required).
     """
-    db = await get_database()
 
     doc = {
         "first_name": data.first_name.strip(),
@@ -42,16 +41,16 @@ async def create_career_application(data: CareerApplicationCreate):
 
 
 @router.get("/", status_code=200)
-async def list_career_applications(page: int = 1, limit: int = 20):
+async def list_career_applications(page: int = 1, limit: int = 20, db=Depends(get_database)):
     """
     List all career applications (admin use).
     """
-    db = await get_database()
     skip = (page - 1) * limit
     cursor = db.career_applications.find().sort("created_at", -1).skip(skip).limit(limit)
     items = []
     async for doc in cursor:
         doc["_id"] = str(doc["_id"])
         items.append(doc)
-    total = await db.career_applications.count_documents({})
+    # Unfiltered list: collection metadata count instead of a full scan.
+    total = await db.career_applications.estimated_document_count()
     return {"total": total, "page": page, "limit": limit, "items": items}
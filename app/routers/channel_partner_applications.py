@@ -3,7 +3,7 @@ Public lead form: Channel Partner Application.
 Stores partnership enquiries with applicant details.
 No authentication required — anyone can apply.
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from datetime import datetime
 from app.schemas import ChannelPartnerApplication, ChannelPartnerApplicationCreate
 from app.database import get_database
@@ -12,11 +12,10 @@ router = APIRouter()
 
 
 @router.post("/", response_model=ChannelPartnerApplication, status_code=201)
-async def create_channel_partner_application(data: ChannelPartnerApplicationCreate):
+async def create_channel_partner_application(data: ChannelPartnerApplicationCreate, db=Depends(get_database)):
     """
     Submit a channel partner application (public — no login required).
     """
-    db = await get_database()
 
     doc = {
         "full_name": data.full_name.strip(),
@@ -36,16 +35,16 @@ async def create_channel_partner_application(data: ChannelPartnerApplicationCrea
 
 
 @router.get("/", status_code=200)
-async def list_channel_partner_applications(page: int = 1, limit: int = 20):
+async def list_channel_partner_applications(page: int = 1, limit: int = 20, db=Depends(get_database)):
     """
     List all channel partner applications (admin use).
     """
-    db = await get_database()
     skip = (page - 1) * limit
     cursor = db.channel_partner_applications.find().sort("created_at", -1).skip(skip).limit(limit)
     items = []
     async for doc in cursor:
         doc["_id"] = str(doc["_id"])
         items.append(doc)
-    total = await db.channel_partner_applications.count_documents({})
+    # Unfiltered list: collection metadata count instead of a full scan.
+    total = await db.channel_partner_applications.estimated_document_count()
     return {"total": total, "page": page, "limit": limit, "items": items}
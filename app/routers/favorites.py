@@ -1,44 +1,41 @@
-import math
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
-from bson import ObjectId
 from datetime import datetime
 from app.schemas import Favorite, FavoriteCreate, PropertyListResponse
 from app.database import get_database
+from app.object_ids import parse_object_id
+from app.responses import model_json_response
 
 router = APIRouter()
 
 
 @router.post("/", response_model=Favorite, status_code=201)
-async def create_favorite(favorite: FavoriteCreate):
+async def create_favorite(favorite: FavoriteCreate, db=Depends(get_database)):
     """Add a property to favorites"""
-    db = await get_database()
     
     # Validate property exists
-    if not ObjectId.is_valid(favorite.property_id):
-        raise HTTPException(status_code=400, detail="Invalid property ID")
-    property_exists = await db.properties.find_one({"_id": ObjectId(favorite.property_id)})
+    property_oid = parse_object_id(favorite.property_id, "property")
+    property_exists = await db.properties.find_one({"_id": property_oid})
     if not property_exists:
         raise HTTPException(status_code=404, detail="Property not found")
     
     # Validate user exists
-    if not ObjectId.is_valid(favorite.user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
-    user_exists = await db.users.find_one({"_id": ObjectId(favorite.user_id)})
+    user_oid = parse_object_id(favorite.user_id, "user")
+    user_exists = await db.users.find_one({"_id": user_oid})
     if not user_exists:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Check if already favorited
     existing_favorite = await db.favorites.find_one({
-        "user_id": ObjectId(favorite.user_id),
-        "property_id": ObjectId(favorite.property_id)
+        "user_id": user_oid,
+        "property_id": property_oid
     })
     if existing_favorite:
         raise HTTPException(status_code=400, detail="Property already in favorites")
     
     favorite_dict = favorite.dict()
-    favorite_dict["property_id"] = ObjectId(favorite_dict["property_id"])
-    favorite_dict["user_id"] = ObjectId(favorite_dict["user_id"])
+    favorite_dict["property_id"] = property_oid
+    favorite_dict["user_id"] = user_oid
     favorite_dict["created_at"] = datetime.utcnow()
     
     result = await db.favorites.insert_one(favorite_dict)
@@ -58,31 +55,27 @@ async def get_user_shortlist(
     ),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(12, ge=1, le=100, description="Items per page"),
+    db=Depends(get_database),
 ):
     """
     ShortList (Rent/Buy): Get user's shortlisted properties with full details.
     Optionally filter by transaction_type: 'rent' (Rent) or 'sale' (Buy).
     Returns paginated list of property objects for the ShortList screen.
     """
-    db = await get_database()
-    if not ObjectId.is_valid(user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
+    user_oid = parse_object_id(user_id, "user")
 
     # Get user's favorite property IDs in order (newest first)
-    cursor = db.favorites.find({"user_id": ObjectId(user_id)}).sort("created_at", -1)
+    cursor = db.favorites.find({"user_id": user_oid}).sort("created_at", -1)
     favorites = await cursor.to_list(length=1000)
     property_ids = [f["property_id"] for f in favorites]
 
     if not property_ids:
-        return PropertyListResponse(
+        return model_json_response(PropertyListResponse(
             properties=[],
             total=0,
             page=page,
             limit=limit,
-            total_pages=0,
-            has_next=False,
-            has_prev=False,
-        )
+        ))
 
     # Build property query: _id in list and optional transaction_type
     query = {"_id": {"$in": property_ids}}
@@ -107,26 +100,20 @@ async def get_user_shortlist(
         prop["_id"] = str(prop["_id"])
         prop["owner_id"] = str(prop["owner_id"])
 
-    total_pages = math.ceil(total / limit) if total > 0 else 0
-    return PropertyListResponse(
+    return model_json_response(PropertyListResponse(
         properties=properties,
         total=total,
         page=page,
         limit=limit,
-        total_pages=total_pages,
-        has_next=page < total_pages,
-        has_prev=page > 1,
-    )
+    ))
 
 
 @router.get("/user/{user_id}", response_model=List[Favorite])
-async def get_user_favorites(user_id: str):
+async def get_user_favorites(user_id: str, db=Depends(get_database)):
     """Get all favorites for a specific user"""
-    db = await get_database()
-    if not ObjectId.is_valid(user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
+    user_oid = parse_object_id(user_id, "user")
     
-    cursor = db.favorites.find({"user_id": ObjectId(user_id)}).sort("created_at", -1)
+    cursor = db.favorites.find({"user_id": user_oid}).sort("created_at", -1)
     favorites = await cursor.to_list(length=100)
     
     for favorite in favorites:
@@ -138,13 +125,11 @@ async def get_user_favorites(user_id: str):
 
 
 @router.get("/{favorite_id}", response_model=Favorite)
-async def get_favorite(favorite_id: str):
+async def get_favorite(favorite_id: str, db=Depends(get_database)):
     """Get a specific favorite by ID"""
-    db = await get_database()
-    if not ObjectId.is_valid(favorite_id):
-        raise HTTPException(status_code=400, detail="Invalid favorite ID")
+    favorite_oid = parse_object_id(favorite_id, "favorite")
     
-    favorite = await db.favorites.find_one({"_id": ObjectId(favorite_id)})
+    favorite = await db.favorites.find_one({"_id": favorite_oid})
     if not favorite:
         raise HTTPException(status_code=404, detail="Favorite not found")
     
@@ -155,13 +140,11 @@ async def get_favorite(favorite_id: str):
 
 
 @router.delete("/{favorite_id}", status_code=204)
-async def delete_favorite(favorite_id: str):
+async def delete_favorite(favorite_id: str, db=Depends(get_database)):
     """Remove a property from favorites"""
-    db = await get_database()
-    if not ObjectId.is_valid(favorite_id):
-        raise HTTPException(status_code=400, detail="Invalid favorite ID")
+    favorite_oid = parse_object_id(favorite_id, "favorite")
     
-    result = await db.favorites.delete_one({"_id": ObjectId(favorite_id)})
+    result = await db.favorites.delete_one({"_id": favorite_oid})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Favorite not found")
     
@@ -169,15 +152,14 @@ async def delete_favorite(favorite_id: str):
 
 
 @router.delete("/user/{user_id}/property/{property_id}", status_code=204)
-async def remove_favorite_by_property(user_id: str, property_id: str):
+async def remove_favorite_by_property(user_id: str, property_id: str, db=Depends(get_database)):
     """Remove a specific property from user's favorites"""
-    db = await get_database()
-    if not ObjectId.is_valid(user_id) or not ObjectId.is_valid(property_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID or property ID")
+    user_oid = parse_object_id(user_id, "user")
+    property_oid = parse_object_id(property_id, "property")
     
     result = await db.favorites.delete_one({
-        "user_id": ObjectId(user_id),
-        "property_id": ObjectId(property_id)
+        "user_id": user_oid,
+        "property_id": property_oid
     })
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Favorite not found")
@@ -3,7 +3,7 @@ Filter Screen API - Returns all filter options for the property search/filter UI
 Used to populate dropdowns, sliders, and checkboxes on the filter screen.
 """
 import datetime
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from typing import List, Optional
 from app.database import get_database
 
@@ -13,6 +13,7 @@ router = APIRouter()
 @router.get("/")
 async def get_filter_screen_options(
     transaction_type: Optional[str] = None,
+    db=Depends(get_database),
 ):
     """
     Get all filter options for the Filter Screen UI.
@@ -20,7 +21,6 @@ async def get_filter_screen_options(
     so the frontend can populate filter dropdowns and sliders.
     Optionally pass transaction_type to get options scoped to sale or rent only.
     """
-    db = await get_database()
     match_stage = {}
     if transaction_type:
         match_stage["transaction_type"] = transaction_type.lower()
@@ -3,10 +3,11 @@ Home Screen API - Returns sectioned property data for the home screen.
 Sections: Top Selling Projects (in city), Recommend Your Location, Property for Rent.
 Each property includes id, title, location, price, price_display, image_url, etc. for cards.
 """
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Depends
 from typing import Optional, List, Any
 from bson import ObjectId
 from app.database import get_database
+from app.text_match import contains_ci
 from app.upload_urls import canonical_client_image_url, get_public_origin
 
 router = APIRouter()
@@ -109,12 +110,12 @@ async def get_home_sections(
         description="Filter by tab: all | buy | rent | projects | residential | commercial",
     ),
     limit: int = Query(SECTION_LIMIT, ge=1, le=20, description="Max properties per section"),
+    db=Depends(get_database),
 ):
     """
     Home Screen: Get sectioned data for Top Selling Projects, Recommend Your Location, and Property for Rent.
     transaction_type: all | buy (sale only) | rent (rent only) | projects (under_construction) | residential | commercial.
     """
-    db = await get_database()
     city_filter = (city or DEFAULT_CITY).strip() or DEFAULT_CITY
     filter_type = (transaction_type or "all").strip().lower()
 
@@ -188,7 +189,7 @@ async def get_home_sections(
         # transaction tab is active. For "buy" tab restrict to sale; for "rent" tab
         # restrict to rent; for "all" / "residential" / "commercial" show both.
         top_match: dict = {
-            "location.city": {"$regex": city_filter, "$options": "i"},
+            "location.city": contains_ci(city_filter),
             **category_filter,
         }
         if filter_type == "buy":
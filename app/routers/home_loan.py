@@ -3,12 +3,13 @@ Home Loan Screen API - Submit and list home loan applications.
 Stores application data from the Apply Loan form (loan type, name, email, phone, address).
 """
 import math
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
 from bson import ObjectId
 from datetime import datetime
 from app.schemas import HomeLoanApplication, HomeLoanApplicationCreate
 from app.database import get_database
+from app.object_ids import parse_object_id
 
 router = APIRouter()
 
@@ -16,7 +17,7 @@ VALID_LOAN_TYPES = {"home loan", "commercial loan", "residential loan"}
 
 
 @router.post("/", response_model=HomeLoanApplication, status_code=201)
-async def submit_home_loan_application(data: HomeLoanApplicationCreate):
+async def submit_home_loan_application(data: HomeLoanApplicationCreate, db=Depends(get_database)):
     """
     Home Loan Screen – Submit application. Stores in DB.
     loan_type: "Home Loan" | "Commercial Loan" | "Residential Loan"
@@ -27,7 +28,6 @@ async def submit_home_loan_application(data: HomeLoanApplicationCreate):
             status_code=400,
             detail=f"loan_type must be one of: Home Loan, Commercial Loan, Residential Loan",
         )
-    db = await get_database()
     doc = data.dict()
     doc["loan_type"] = data.loan_type.strip()
     doc["status"] = "submitted"
@@ -52,12 +52,11 @@ async def get_user_applications(
     user_id: str,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    db=Depends(get_database),
 ):
     """List home loan applications for a user (paginated)."""
-    db = await get_database()
-    if not ObjectId.is_valid(user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
-    query = {"user_id": ObjectId(user_id)}
+    user_oid = parse_object_id(user_id, "user")
+    query = {"user_id": user_oid}
     total = await db.home_loan_applications.count_documents(query)
     skip = (page - 1) * limit
     cursor = (
@@ -87,12 +86,10 @@ async def get_user_applications(
 
 
 @router.get("/{application_id}", response_model=HomeLoanApplication)
-async def get_application(application_id: str):
+async def get_application(application_id: str, db=Depends(get_database)):
     """Get a single home loan application by ID."""
-    db = await get_database()
-    if not ObjectId.is_valid(application_id):
-        raise HTTPException(status_code=400, detail="Invalid application ID")
-    app = await db.home_loan_applications.find_one({"_id": ObjectId(application_id)})
+    application_oid = parse_object_id(application_id, "application")
+    app = await db.home_loan_applications.find_one({"_id": application_oid})
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
     app["_id"] = str(app["_id"])
@@ -1,35 +1,32 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
-from bson import ObjectId
 from datetime import datetime
 from app.schemas import Inquiry, InquiryCreate, InquiryUpdate
 from app.database import get_database
+from app.object_ids import parse_object_id
 
 router = APIRouter()
 
 
 @router.post("/", response_model=Inquiry, status_code=201)
-async def create_inquiry(inquiry: InquiryCreate):
+async def create_inquiry(inquiry: InquiryCreate, db=Depends(get_database)):
     """Create a new inquiry"""
-    db = await get_database()
     
     # Validate property exists
-    if not ObjectId.is_valid(inquiry.property_id):
-        raise HTTPException(status_code=400, detail="Invalid property ID")
-    property_exists = await db.properties.find_one({"_id": ObjectId(inquiry.property_id)})
+    property_oid = parse_object_id(inquiry.property_id, "property")
+    property_exists = await db.properties.find_one({"_id": property_oid})
     if not property_exists:
         raise HTTPException(status_code=404, detail="Property not found")
     
     # Validate user exists
-    if not ObjectId.is_valid(inquiry.user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
-    user_exists = await db.users.find_one({"_id": ObjectId(inquiry.user_id)})
+    user_oid = parse_object_id(inquiry.user_id, "user")
+    user_exists = await db.users.find_one({"_id": user_oid})
     if not user_exists:
         raise HTTPException(status_code=404, detail="User not found")
     
     inquiry_dict = inquiry.model_dump(exclude_none=True)
-    inquiry_dict["property_id"] = ObjectId(inquiry_dict["property_id"])
-    inquiry_dict["user_id"] = ObjectId(inquiry_dict["user_id"])
+    inquiry_dict["property_id"] = property_oid
+    inquiry_dict["user_id"] = user_oid
     inquiry_dict["status"] = "pending"
     inquiry_dict["created_at"] = datetime.utcnow()
     
@@ -48,23 +45,19 @@ async def get_inquiries(
     property_id: Optional[str] = None,
     user_id: Optional[str] = None,
     owner_id: Optional[str] = None,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    db=Depends(get_database)
 ):
     """Get all inquiries with optional filters. Use owner_id to list inquiries on that user's listed properties."""
-    db = await get_database()
     query = {}
 
     if status:
         query["status"] = status
 
     if owner_id:
-        if not ObjectId.is_valid(owner_id):
-            raise HTTPException(status_code=400, detail="Invalid owner ID")
-        owner_oid = ObjectId(owner_id)
+        owner_oid = parse_object_id(owner_id, "owner")
         if property_id:
-            if not ObjectId.is_valid(property_id):
-                raise HTTPException(status_code=400, detail="Invalid property ID")
-            pid = ObjectId(property_id)
+            pid = parse_object_id(property_id, "property")
             prop = await db.properties.find_one({"_id": pid, "owner_id": owner_oid})
             if not prop:
                 raise HTTPException(status_code=404, detail="Property not found or not owned by this user")
@@ -76,14 +69,10 @@ async def get_inquiries(
                 return []
             query["property_id"] = {"$in": prop_ids}
     elif property_id:
-        if not ObjectId.is_valid(property_id):
-            raise HTTPException(status_code=400, detail="Invalid property ID")
-        query["property_id"] = ObjectId(property_id)
+        query["property_id"] = parse_object_id(property_id, "property")
 
     if user_id:
-        if not ObjectId.is_valid(user_id):
-            raise HTTPException(status_code=400, detail="Invalid user ID")
-        query["user_id"] = ObjectId(user_id)
+        query["user_id"] = parse_object_id(user_id, "user")
     
     cursor = db.inquiries.find(query).skip(skip).limit(limit).sort("created_at", -1)
     inquiries = await cursor.to_list(length=limit)
@@ -97,13 +86,11 @@ async def get_inquiries(
 
 
 @router.get("/{inquiry_id}", response_model=Inquiry)
-async def get_inquiry(inquiry_id: str):
+async def get_inquiry(inquiry_id: str, db=Depends(get_database)):
     """Get a specific inquiry by ID"""
-    db = await get_database()
-    if not ObjectId.is_valid(inquiry_id):
-        raise HTTPException(status_code=400, detail="Invalid inquiry ID")
+    inquiry_oid = parse_object_id(inquiry_id, "inquiry")
     
-    inquiry = await db.inquiries.find_one({"_id": ObjectId(inquiry_id)})
+    inquiry = await db.inquiries.find_one({"_id": inquiry_oid})
     if not inquiry:
         raise HTTPException(status_code=404, detail="Inquiry not found")
     
@@ -114,11 +101,9 @@ async def get_inquiry(inquiry_id: str):
 
 
 @router.put("/{inquiry_id}", response_model=Inquiry)
-async def update_inquiry(inquiry_id: str, inquiry_update: InquiryUpdate):
+async def update_inquiry(inquiry_id: str, inquiry_update: InquiryUpdate, db=Depends(get_database)):
     """Update an inquiry"""
-    db = await get_database()
-    if not ObjectId.is_valid(inquiry_id):
-        raise HTTPException(status_code=400, detail="Invalid inquiry ID")
+    inquiry_oid = parse_object_id(inquiry_id, "inquiry")
     
     update_data = inquiry_update.model_dump(exclude_unset=True)
     
@@ -130,14 +115,14 @@ async def update_inquiry(inquiry_id: str, inquiry_update: InquiryUpdate):
         update_data["completed_at"] = datetime.utcnow()
     
     result = await db.inquiries.update_one(
-        {"_id": ObjectId(inquiry_id)},
+        {"_id": inquiry_oid},
         {"$set": update_data}
     )
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Inquiry not found")
     
-    updated_inquiry = await db.inquiries.find_one({"_id": ObjectId(inquiry_id)})
+    updated_inquiry = await db.inquiries.find_one({"_id": inquiry_oid})
     updated_inquiry["_id"] = str(updated_inquiry["_id"])
     updated_inquiry["property_id"] = str(updated_inquiry["property_id"])
     updated_inquiry["user_id"] = str(updated_inquiry["user_id"])
@@ -145,13 +130,11 @@ async def update_inquiry(inquiry_id: str, inquiry_update: InquiryUpdate):
 
 
 @router.delete("/{inquiry_id}", status_code=204)
-async def delete_inquiry(inquiry_id: str):
+async def delete_inquiry(inquiry_id: str, db=Depends(get_database)):
     """Delete an inquiry"""
-    db = await get_database()
-    if not ObjectId.is_valid(inquiry_id):
-        raise HTTPException(status_code=400, detail="Invalid inquiry ID")
+    inquiry_oid = parse_object_id(inquiry_id, "inquiry")
     
-    result = await db.inquiries.delete_one({"_id": ObjectId(inquiry_id)})
+    result = await db.inquiries.delete_one({"_id": inquiry_oid})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Inquiry not found")
     
@@ -3,29 +3,23 @@ Notification Screen API - List and manage user notifications.
 UI: tabs All | Property Alerts | Plan; cards with title, body, action button; swipe-to-delete.
 Supports: tab filter, pagination, unread count, mark-as-read, delete by id.
 """
-import math
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
-from bson import ObjectId
 from datetime import datetime
 from app.schemas import (
+    PLAN_TYPES,
+    PROPERTY_ALERT_TYPES,
     Notification,
     NotificationCreate,
     NotificationUpdate,
     NotificationListResponse,
 )
 from app.database import get_database
+from app.object_ids import parse_object_id
+from app.responses import model_json_response
 
 router = APIRouter()
 
-# Tab "Property Alerts": types that show in Property Alerts tab
-PROPERTY_ALERT_TYPES = {
-    "price_drop", "new_listing", "plot_available", "price_alert",
-    "favorite", "inquiry", "listing_approved", "property_alert",
-}
-# Tab "Plan": types that show in Plan tab
-PLAN_TYPES = {"subscription", "plan", "plan_expiring"}
-
 
 @router.get("/user/{user_id}", response_model=NotificationListResponse)
 async def get_user_notifications(
@@ -45,16 +39,15 @@ async def get_user_notifications(
     ),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    db=Depends(get_database),
 ):
     """
     Notification Screen: Get paginated list for a user.
     Tabs: all | property_alerts | plan. Returns unread_count for badge.
     """
-    db = await get_database()
-    if not ObjectId.is_valid(user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
+    user_oid = parse_object_id(user_id, "user")
 
-    query = {"user_id": ObjectId(user_id)}
+    query = {"user_id": user_oid}
     if read is not None:
         query["read"] = read
 
@@ -68,7 +61,7 @@ async def get_user_notifications(
 
     total = await db.notifications.count_documents(query)
     unread_count = await db.notifications.count_documents(
-        {"user_id": ObjectId(user_id), "read": False}
+        {"user_id": user_oid, "read": False}
     )
     skip = (page - 1) * limit
     cursor = (
@@ -83,39 +76,32 @@ async def get_user_notifications(
         n["_id"] = str(n["_id"])
         n["user_id"] = str(n["user_id"])
 
-    total_pages = math.ceil(total / limit) if total > 0 else 0
-    return NotificationListResponse(
+    return model_json_response(NotificationListResponse(
         notifications=notifications,
         total=total,
         page=page,
         limit=limit,
-        total_pages=total_pages,
-        has_next=page < total_pages,
-        has_prev=page > 1,
         unread_count=unread_count,
-    )
+    ))
 
 
 @router.get("/user/{user_id}/unread-count")
-async def get_unread_count(user_id: str):
+async def get_unread_count(user_id: str, db=Depends(get_database)):
     """
     Get unread notification count for badge (e.g. home screen bell icon).
     """
-    db = await get_database()
-    if not ObjectId.is_valid(user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
+    user_oid = parse_object_id(user_id, "user")
     count = await db.notifications.count_documents(
-        {"user_id": ObjectId(user_id), "read": False}
+        {"user_id": user_oid, "read": False}
     )
     return {"success": True, "data": {"unread_count": count}}
 
 
 @router.post("/", response_model=Notification, status_code=201)
-async def create_notification(notification: NotificationCreate):
+async def create_notification(notification: NotificationCreate, db=Depends(get_database)):
     """Create a notification (e.g. when inquiry is sent, someone favorites a listing)."""
-    db = await get_database()
     doc = notification.dict()
-    doc["user_id"] = ObjectId(doc["user_id"])
+    doc["user_id"] = parse_object_id(doc["user_id"], "user")
     doc["read"] = doc.get("read", False)
     doc["created_at"] = datetime.utcnow()
     result = await db.notifications.insert_one(doc)
@@ -126,34 +112,30 @@ async def create_notification(notification: NotificationCreate):
 
 
 @router.patch("/{notification_id}", response_model=Notification)
-async def update_notification(notification_id: str, update: NotificationUpdate):
+async def update_notification(notification_id: str, update: NotificationUpdate, db=Depends(get_database)):
     """Update a notification (e.g. mark as read)."""
-    db = await get_database()
-    if not ObjectId.is_valid(notification_id):
-        raise HTTPException(status_code=400, detail="Invalid notification ID")
+    notification_oid = parse_object_id(notification_id, "notification")
     data = update.dict(exclude_unset=True)
     if not data:
         raise HTTPException(status_code=400, detail="No fields to update")
     result = await db.notifications.update_one(
-        {"_id": ObjectId(notification_id)},
+        {"_id": notification_oid},
         {"$set": data},
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Notification not found")
-    updated = await db.notifications.find_one({"_id": ObjectId(notification_id)})
+    updated = await db.notifications.find_one({"_id": notification_oid})
     updated["_id"] = str(updated["_id"])
     updated["user_id"] = str(updated["user_id"])
     return updated
 
 
 @router.post("/user/{user_id}/mark-all-read")
-async def mark_all_read(user_id: str):
+async def mark_all_read(user_id: str, db=Depends(get_database)):
     """Mark all notifications as read for a user."""
-    db = await get_database()
-    if not ObjectId.is_valid(user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
+    user_oid = parse_object_id(user_id, "user")
     result = await db.notifications.update_many(
-        {"user_id": ObjectId(user_id), "read": False},
+        {"user_id": user_oid, "read": False},
         {"$set": {"read": True}},
     )
     return {
@@ -163,12 +145,10 @@ async def mark_all_read(user_id: str):
 
 
 @router.get("/{notification_id}", response_model=Notification)
-async def get_notification(notification_id: str):
+async def get_notification(notification_id: str, db=Depends(get_database)):
     """Get a single notification by ID."""
-    db = await get_database()
-    if not ObjectId.is_valid(notification_id):
-        raise HTTPException(status_code=400, detail="Invalid notification ID")
-    n = await db.notifications.find_one({"_id": ObjectId(notification_id)})
+    notification_oid = parse_object_id(notification_id, "notification")
+    n = await db.notifications.find_one({"_id": notification_oid})
     if not n:
         raise HTTPException(status_code=404, detail="Notification not found")
     n["_id"] = str(n["_id"])
@@ -177,12 +157,10 @@ async def get_notification(notification_id: str):
 
 
 @router.delete("/{notification_id}", status_code=204)
-async def delete_notification(notification_id: str):
+async def delete_notification(notification_id: str, db=Depends(get_database)):
     """Delete a notification."""
-    db = await get_database()
-    if not ObjectId.is_valid(notification_id):
-        raise HTTPException(status_code=400, detail="Invalid notification ID")
-    result = await db.notifications.delete_one({"_id": ObjectId(notification_id)})
+    notification_oid = parse_object_id(notification_id, "notification")
+    result = await db.notifications.delete_one({"_id": notification_oid})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Notification not found")
     return None
@@ -3,22 +3,22 @@ NRI Center Screen API - Submit and list NRI queries.
 Stores query form data: first name, last name, email, phone, state, country, message.
 """
 import math
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import Optional
 from bson import ObjectId
 from datetime import datetime
 from app.schemas import NRIQuery, NRIQueryCreate
 from app.database import get_database
+from app.object_ids import parse_object_id
 
 router = APIRouter()
 
 
 @router.post("/", response_model=NRIQuery, status_code=201)
-async def submit_nri_query(data: NRIQueryCreate):
+async def submit_nri_query(data: NRIQueryCreate, db=Depends(get_database)):
     """
     NRI Center - NRI QUERY form submit.
     """
-    db = await get_database()
     doc = data.dict()
     doc["created_at"] = datetime.utcnow()
     if doc.get("user_id") and ObjectId.is_valid(doc["user_id"]):
@@ -38,14 +38,13 @@ async def get_user_nri_queries(
     user_id: str,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    db=Depends(get_database),
 ):
     """
     List NRI queries for a user (optional for admin / profile usage).
     """
-    db = await get_database()
-    if not ObjectId.is_valid(user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
-    query = {"user_id": ObjectId(user_id)}
+    user_oid = parse_object_id(user_id, "user")
+    query = {"user_id": user_oid}
     total = await db.nri_queries.count_documents(query)
     skip = (page - 1) * limit
     cursor = (
@@ -75,14 +74,12 @@ async def get_user_nri_queries(
 
 
 @router.get("/{query_id}", response_model=NRIQuery)
-async def get_nri_query(query_id: str):
+async def get_nri_query(query_id: str, db=Depends(get_database)):
     """
     Get a single NRI query by ID.
     """
-    db = await get_database()
-    if not ObjectId.is_valid(query_id):
-        raise HTTPException(status_code=400, detail="Invalid query ID")
-    doc = await db.nri_queries.find_one({"_id": ObjectId(query_id)})
+    query_oid = parse_object_id(query_id, "query")
+    doc = await db.nri_queries.find_one({"_id": query_oid})
     if not doc:
         raise HTTPException(status_code=404, detail="Query not found")
     doc["_id"] = str(doc["_id"])
@@ -1,13 +1,14 @@
 """
 Order History Screen API - List and manage user orders (subscription/plan purchases).
 """
-import math
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
 from bson import ObjectId
 from datetime import datetime
 from app.schemas import Order, OrderCreate, OrderUpdate, OrderListResponse
 from app.database import get_database
+from app.object_ids import parse_object_id
+from app.responses import model_json_response
 
 router = APIRouter()
 
@@ -28,16 +29,15 @@ async def get_user_orders(
     ),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    db=Depends(get_database),
 ):
     """
     Order History Screen: Get paginated list of orders for a user.
     Optional status filter. Orders sorted by created_at descending.
     """
-    db = await get_database()
-    if not ObjectId.is_valid(user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
+    user_oid = parse_object_id(user_id, "user")
 
-    query = {"user_id": ObjectId(user_id)}
+    query = {"user_id": user_oid}
     if status:
         query["status"] = status.strip().lower()
 
@@ -60,24 +60,19 @@ async def get_user_orders(
             o.get("order_number") or o["_id"],
         )
 
-    total_pages = math.ceil(total / limit) if total > 0 else 0
-    return OrderListResponse(
+    return model_json_response(OrderListResponse(
         orders=orders,
         total=total,
         page=page,
         limit=limit,
-        total_pages=total_pages,
-        has_next=page < total_pages,
-        has_prev=page > 1,
-    )
+    ))
 
 
 @router.post("/", response_model=Order, status_code=201)
-async def create_order(order: OrderCreate):
+async def create_order(order: OrderCreate, db=Depends(get_database)):
     """Create an order (e.g. when user purchases a subscription plan)."""
-    db = await get_database()
     doc = order.dict()
-    doc["user_id"] = ObjectId(doc["user_id"])
+    doc["user_id"] = parse_object_id(doc["user_id"], "user")
     doc["created_at"] = datetime.utcnow()
     if not doc.get("order_number"):
         doc["order_number"] = str(ObjectId())[-9:]
@@ -94,12 +89,10 @@ async def create_order(order: OrderCreate):
 
 
 @router.get("/{order_id}", response_model=Order)
-async def get_order(order_id: str):
+async def get_order(order_id: str, db=Depends(get_database)):
     """Get a single order by ID."""
-    db = await get_database()
-    if not ObjectId.is_valid(order_id):
-        raise HTTPException(status_code=400, detail="Invalid order ID")
-    o = await db.orders.find_one({"_id": ObjectId(order_id)})
+    order_oid = parse_object_id(order_id, "order")
+    o = await db.orders.find_one({"_id": order_oid})
     if not o:
         raise HTTPException(status_code=404, detail="Order not found")
     o["_id"] = str(o["_id"])
@@ -113,21 +106,19 @@ async def get_order(order_id: str):
 
 
 @router.patch("/{order_id}", response_model=Order)
-async def update_order(order_id: str, update: OrderUpdate):
+async def update_order(order_id: str, update: OrderUpdate, db=Depends(get_database)):
     """Update an order (e.g. set status to success after payment)."""
-    db = await get_database()
-    if not ObjectId.is_valid(order_id):
-        raise HTTPException(status_code=400, detail="Invalid order ID")
+    order_oid = parse_object_id(order_id, "order")
     data = update.dict(exclude_unset=True)
     if not data:
         raise HTTPException(status_code=400, detail="No fields to update")
     result = await db.orders.update_one(
-        {"_id": ObjectId(order_id)},
+        {"_id": order_oid},
         {"$set": data},
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Order not found")
-    o = await db.orders.find_one({"_id": ObjectId(order_id)})
+    o = await db.orders.find_one({"_id": order_oid})
     o["_id"] = str(o["_id"])
     o["user_id"] = str(o["user_id"])
     o["title"] = _order_title(
@@ -1,39 +1,50 @@
-from fastapi import APIRouter, HTTPException, Query, Body
+from fastapi import APIRouter, HTTPException, Query, Body, Depends, Response
 from typing import List, Optional
 from bson import ObjectId
 from datetime import datetime
-import math
-import re
 from app.schemas import Property, PropertyCreate, PropertyUpdate, PropertySearchParams, PropertyListResponse, PropertyDeleteActionRequest
+from app.schemas import dump_property_list_json, validate_property_list
 from app.database import get_database
+from app.object_ids import parse_object_id
+from app.request_body import json_body, json_body_openapi
+from app.responses import model_json_response
+from app.text_match import contains_ci
 from app.upload_urls import normalize_property_images_inplace
 
 router = APIRouter()
 
 
+def _property_list_response(docs: List[dict]) -> Response:
+    """
+    Validate raw property documents against List[Property] once and serialize them in
+    pydantic-core. Returning the Response skips FastAPI's second response_model pass;
+    ObjectId fields are accepted as-is and written as hex strings.
+    """
+    return Response(dump_property_list_json(validate_property_list(docs)), media_type="application/json")
+
+
 def _search_keyword_or_clauses(effective_text: str) -> List[dict]:
     """
     Substring search aligned with Flutter PropertySearchMatcher (city, locality, address,
     title, description, amenities). MongoDB $text is not used: it requires a text index
     and often misses location phrases like 'Greater Noida' that the app finds via fallback.
     """
-    pat = re.escape(effective_text.strip())
+    pat = contains_ci(effective_text.strip())
     return [
-        {"location.city": {"$regex": pat, "$options": "i"}},
-        {"location.locality": {"$regex": pat, "$options": "i"}},
-        {"location.address": {"$regex": pat, "$options": "i"}},
-        {"title": {"$regex": pat, "$options": "i"}},
-        {"description": {"$regex": pat, "$options": "i"}},
-        {"amenities": {"$regex": pat, "$options": "i"}},
+        {"location.city": pat},
+        {"location.locality": pat},
+        {"location.address": pat},
+        {"title": pat},
+        {"description": pat},
+        {"amenities": pat},
     ]
 
 
-@router.post("/", response_model=Property, status_code=201)
-async def create_property(property: PropertyCreate):
+@router.post("/", response_model=Property, status_code=201, openapi_extra=json_body_openapi(PropertyCreate))
+async def create_property(property: PropertyCreate = Depends(json_body(PropertyCreate)), db=Depends(get_database)):
     """Create a new property listing"""
-    db = await get_database()
     property_dict = property.dict()
-    property_dict["owner_id"] = ObjectId(property_dict["owner_id"])
+    property_dict["owner_id"] = parse_object_id(property_dict["owner_id"], "owner")
     property_dict["posted_at"] = datetime.utcnow()
     property_dict.setdefault("listing_status", "active")
     property_dict.setdefault("view_count", 0)
@@ -42,10 +53,6 @@ async def create_property(property: PropertyCreate):
     property_dict.setdefault("removal_reason", None)
     property_dict.setdefault("removal_note", None)
 
-    # Convert nested objects
-    if "images" in property_dict:
-        property_dict["images"] = [img.dict() for img in property.images]
-
     result = await db.properties.insert_one(property_dict)
     created_property = await db.properties.find_one({"_id": result.inserted_id})
     created_property["_id"] = str(created_property["_id"])
@@ -80,13 +87,13 @@ async def get_properties(
     availability_year: Optional[int] = Query(None, ge=2000, le=2100, description="Availability year (e.g. 2025)"),
     age_of_construction: Optional[str] = Query(None, description="Age: 'new_construction', 'less_than_5_years', '5_to_10_years', '10_to_15_years', '15_to_20_years', '15_to_20_plus_years'"),
     sort_by: Optional[str] = Query("posted_at", description="Sort field: 'posted_at', 'price', 'area_sqft'"),
-    sort_order: Optional[str] = Query("desc", description="Sort order: 'asc' or 'desc'")
+    sort_order: Optional[str] = Query("desc", description="Sort order: 'asc' or 'desc'"),
+    db=Depends(get_database)
 ):
     """
     Get all properties with advanced filters, sorting, and pagination.
     Perfect for property listing pages with search and filter functionality.
     """
-    db = await get_database()
     query = {}
 
     effective_text = (search or text or "").strip()
@@ -129,9 +136,9 @@ async def get_properties(
     
     # Location filters
     if city:
-        query["location.city"] = {"$regex": city, "$options": "i"}
+        query["location.city"] = contains_ci(city)
     if locality:
-        query["location.locality"] = {"$regex": locality, "$options": "i"}
+        query["location.locality"] = contains_ci(locality)
     
     # Room filters
     if store_room is not None:
@@ -163,8 +170,11 @@ async def get_properties(
     sort_direction = -1 if sort_order.lower() == "desc" else 1
     sort_criteria = [(sort_field, sort_direction)]
     
-    # Get total count for pagination
-    total = await db.properties.count_documents(query)
+    # Get total count for pagination (unfiltered: collection metadata count instead of a full scan)
+    if query:
+        total = await db.properties.count_documents(query)
+    else:
+        total = await db.properties.estimated_document_count()
     
     # Fetch properties
     cursor = db.properties.find(query).sort(sort_criteria).skip(skip).limit(limit)
@@ -176,20 +186,12 @@ async def get_properties(
         prop["owner_id"] = str(prop["owner_id"])
         normalize_property_images_inplace(prop)
 
-    # Calculate pagination metadata
-    total_pages = math.ceil(total / limit) if total > 0 else 0
-    has_next = page < total_pages
-    has_prev = page > 1
-
-    return PropertyListResponse(
+    return model_json_response(PropertyListResponse(
         properties=properties,
         total=total,
         page=page,
         limit=limit,
-        total_pages=total_pages,
-        has_next=has_next,
-        has_prev=has_prev
-    )
+    ))
 
 
 @router.get("/my-listings/{owner_id}", response_model=PropertyListResponse)
@@ -201,17 +203,16 @@ async def get_my_listings(
     ),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(12, ge=1, le=100, description="Items per page"),
+    db=Depends(get_database),
 ):
     """
     My Listing Screen: Get properties owned by a user with status filter and pagination.
     Returns full property details plus saves (favorite count) and listing_status, view_count.
     Tabs: All, Active, Pending, Rejected.
     """
-    db = await get_database()
-    if not ObjectId.is_valid(owner_id):
-        raise HTTPException(status_code=400, detail="Invalid owner ID")
+    owner_oid = parse_object_id(owner_id, "owner")
 
-    query = {"owner_id": ObjectId(owner_id)}
+    query = {"owner_id": owner_oid}
     status_lower = (status or "all").lower()
     if status_lower not in ("all", "active", "pending", "rejected"):
         status_lower = "all"
@@ -253,24 +254,20 @@ async def get_my_listings(
         prop.setdefault("availability_message", None)
         normalize_property_images_inplace(prop)
 
-    total_pages = math.ceil(total / limit) if total > 0 else 0
-    return PropertyListResponse(
+    return model_json_response(PropertyListResponse(
         properties=properties,
         total=total,
         page=page,
         limit=limit,
-        total_pages=total_pages,
-        has_next=page < total_pages,
-        has_prev=page > 1,
-    )
+    ))
 
 
 @router.get("/search", response_model=List[Property])
 async def search_properties(
     text: Optional[str] = None,
     search: Optional[str] = None,
-    longitude: Optional[float] = None,
-    latitude: Optional[float] = None,
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
+    latitude: Optional[float] = Query(None, ge=-90, le=90),
     max_distance: int = Query(5000, ge=1),
     transaction_type: Optional[str] = None,
     property_subtype: Optional[str] = Query(None, description="Filter by property type e.g. Flats, Villa"),
@@ -281,10 +278,10 @@ async def search_properties(
     min_bedrooms: Optional[int] = None,
     min_bathrooms: Optional[int] = None,
     skip: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1, le=100)
+    limit: int = Query(10, ge=1, le=100),
+    db=Depends(get_database)
 ):
     """Advanced search with text search and geo search"""
-    db = await get_database()
     query = {}
     
     # Keyword search (same behaviour as GET / list — see _search_keyword_or_clauses)
@@ -328,21 +325,17 @@ async def search_properties(
     properties = await cursor.to_list(length=limit)
     
     for prop in properties:
-        prop["_id"] = str(prop["_id"])
-        prop["owner_id"] = str(prop["owner_id"])
         normalize_property_images_inplace(prop)
 
-    return properties
+    return _property_list_response(properties)
 
 
 @router.get("/{property_id}", response_model=Property)
-async def get_property(property_id: str):
+async def get_property(property_id: str, db=Depends(get_database)):
     """Get a specific property by ID"""
-    db = await get_database()
-    if not ObjectId.is_valid(property_id):
-        raise HTTPException(status_code=400, detail="Invalid property ID")
+    property_oid = parse_object_id(property_id, "property")
     
-    property = await db.properties.find_one({"_id": ObjectId(property_id)})
+    property = await db.properties.find_one({"_id": property_oid})
     if not property:
         raise HTTPException(status_code=404, detail="Property not found")
     
@@ -353,11 +346,9 @@ async def get_property(property_id: str):
 
 
 @router.put("/{property_id}", response_model=Property)
-async def update_property(property_id: str, property_update: PropertyUpdate):
+async def update_property(property_id: str, property_update: PropertyUpdate, db=Depends(get_database)):
     """Update a property"""
-    db = await get_database()
-    if not ObjectId.is_valid(property_id):
-        raise HTTPException(status_code=400, detail="Invalid property ID")
+    property_oid = parse_object_id(property_id, "property")
     
     update_data = property_update.dict(exclude_unset=True)
     
@@ -368,14 +359,14 @@ async def update_property(property_id: str, property_update: PropertyUpdate):
         raise HTTPException(status_code=400, detail="No fields to update")
     
     result = await db.properties.update_one(
-        {"_id": ObjectId(property_id)},
+        {"_id": property_oid},
         {"$set": update_data}
     )
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Property not found")
     
-    updated_property = await db.properties.find_one({"_id": ObjectId(property_id)})
+    updated_property = await db.properties.find_one({"_id": property_oid})
     updated_property["_id"] = str(updated_property["_id"])
     updated_property["owner_id"] = str(updated_property["owner_id"])
     normalize_property_images_inplace(updated_property)
@@ -383,11 +374,9 @@ async def update_property(property_id: str, property_update: PropertyUpdate):
 
 
 @router.delete("/{property_id}", response_model=Property)
-async def delete_property(property_id: str, payload: PropertyDeleteActionRequest = Body(...)):
+async def delete_property(property_id: str, payload: PropertyDeleteActionRequest = Body(...), db=Depends(get_database)):
     """Soft-delete a property by reason and keep record for status display."""
-    db = await get_database()
-    if not ObjectId.is_valid(property_id):
-        raise HTTPException(status_code=400, detail="Invalid property ID")
+    property_oid = parse_object_id(property_id, "property")
 
     reason_to_status = {
         "sold": ("sold", "This property is sold out!"),
@@ -411,13 +400,13 @@ async def delete_property(property_id: str, payload: PropertyDeleteActionRequest
     }
 
     result = await db.properties.update_one(
-        {"_id": ObjectId(property_id)},
+        {"_id": property_oid},
         {"$set": update_data}
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Property not found")
 
-    updated_property = await db.properties.find_one({"_id": ObjectId(property_id)})
+    updated_property = await db.properties.find_one({"_id": property_oid})
     updated_property["_id"] = str(updated_property["_id"])
     updated_property["owner_id"] = str(updated_property["owner_id"])
     normalize_property_images_inplace(updated_property)
@@ -425,21 +414,17 @@ async def delete_property(property_id: str, payload: PropertyDeleteActionRequest
 
 
 @router.get("/owner/{owner_id}", response_model=List[Property])
-async def get_properties_by_owner(owner_id: str):
+async def get_properties_by_owner(owner_id: str, db=Depends(get_database)):
     """Get all properties by a specific owner"""
-    db = await get_database()
-    if not ObjectId.is_valid(owner_id):
-        raise HTTPException(status_code=400, detail="Invalid owner ID")
+    owner_oid = parse_object_id(owner_id, "owner")
     
-    cursor = db.properties.find({"owner_id": ObjectId(owner_id)}).sort("posted_at", -1)
+    cursor = db.properties.find({"owner_id": owner_oid}).sort("posted_at", -1)
     properties = await cursor.to_list(length=100)
     
     for prop in properties:
-        prop["_id"] = str(prop["_id"])
-        prop["owner_id"] = str(prop["owner_id"])
         normalize_property_images_inplace(prop)
 
-    return properties
+    return _property_list_response(properties)
 
 
 
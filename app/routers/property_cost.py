@@ -2,8 +2,7 @@
 Property Cost Screen API - Submit and list property cost calculations.
 Stores estimate form + Annexure I/II/III breakdown and grand total.
 """
-import math
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
 from bson import ObjectId
 from datetime import datetime
@@ -12,6 +11,8 @@ from app.schemas import (
     PropertyCostCalculationCreate,
 )
 from app.database import get_database
+from app.object_ids import parse_object_id
+from app.pagination import NEWEST_FIRST, keyset_filter, next_cursor, page_flags
 
 router = APIRouter()
 
@@ -36,13 +37,12 @@ def _serialize(doc: dict) -> dict:
 
 
 @router.post("/", response_model=PropertyCostCalculation, status_code=201)
-async def submit_property_cost(data: PropertyCostCalculationCreate):
+async def submit_property_cost(data: PropertyCostCalculationCreate, db=Depends(get_database)):
     """
     Property Cost Screen – Submit calculation. Stores in DB and computes grand_total.
     """
-    db = await get_database()
-    doc = data.dict()
-    # data.dict() already serializes annexure lists as list of dicts
+    doc = data.model_dump()
+    # model_dump() already serializes annexure lists as list of dicts (pydantic-core, no per-row Python)
     doc["grand_total"] = _grand_total(doc)
     doc["created_at"] = datetime.utcnow()
     if doc.get("user_id") and ObjectId.is_valid(doc["user_id"]):
@@ -59,24 +59,25 @@ async def get_user_calculations(
     user_id: str,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    after: Optional[datetime] = Query(None, description="Keyset cursor: created_at of the last item seen"),
+    after_id: Optional[str] = Query(None, description="Keyset cursor: _id of the last item seen"),
+    db=Depends(get_database),
 ):
-    """List property cost calculations for a user (paginated), newest first."""
-    db = await get_database()
-    if not ObjectId.is_valid(user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
-    query = {"user_id": ObjectId(user_id)}
+    """
+    List property cost calculations for a user (paginated), newest first.
+    Pass after/after_id from next_cursor for keyset pagination; page is ignored then.
+    """
+    user_oid = parse_object_id(user_id, "user")
+    query = {"user_id": user_oid}
     total = await db.property_cost_calculations.count_documents(query)
-    skip = (page - 1) * limit
-    cursor = (
-        db.property_cost_calculations.find(query)
-        .sort("created_at", -1)
-        .skip(skip)
-        .limit(limit)
-    )
-    items = await cursor.to_list(length=limit)
+    keyset = keyset_filter(after, after_id)
+    cursor = db.property_cost_calculations.find({**query, **keyset} if keyset else query).sort(NEWEST_FIRST)
+    if not keyset:
+        cursor = cursor.skip((page - 1) * limit)
+    items = await cursor.limit(limit).to_list(length=limit)
+    cursor_next = next_cursor(items, limit)
     for doc in items:
         _serialize(doc)
-    total_pages = math.ceil(total / limit) if total > 0 else 0
     return {
         "success": True,
         "data": {
@@ -84,20 +85,17 @@ async def get_user_calculations(
             "total": total,
             "page": page,
             "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_flags(page, limit, total, keyset, cursor_next),
+            "next_cursor": cursor_next,
         },
     }
 
 
 @router.get("/{calculation_id}", response_model=PropertyCostCalculation)
-async def get_calculation(calculation_id: str):
+async def get_calculation(calculation_id: str, db=Depends(get_database)):
     """Get a single property cost calculation by ID."""
-    db = await get_database()
-    if not ObjectId.is_valid(calculation_id):
-        raise HTTPException(status_code=400, detail="Invalid calculation ID")
-    doc = await db.property_cost_calculations.find_one({"_id": ObjectId(calculation_id)})
+    calculation_oid = parse_object_id(calculation_id, "calculation")
+    doc = await db.property_cost_calculations.find_one({"_id": calculation_oid})
     if not doc:
         raise HTTPException(status_code=404, detail="Calculation not found")
     return _serialize(doc)
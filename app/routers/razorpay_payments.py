@@ -13,7 +13,7 @@ from datetime import datetime
 from typing import Any, Dict
 
 import razorpay
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 
 from app.database import get_database
 from app.schemas import RazorpayCreateOrderRequest, RazorpayCreateOrderResponse, RazorpayVerifyRequest, RazorpayVerifyResponse
@@ -61,7 +61,7 @@ def _key_id_public() -> str:
 
 
 @router.post("/create-order", response_model=RazorpayCreateOrderResponse)
-async def create_order(body: RazorpayCreateOrderRequest):
+async def create_order(body: RazorpayCreateOrderRequest, db=Depends(get_database)):
     """Create a Razorpay order and a pending checkout record."""
     pkg = _AD_PACKAGES.get(body.package_id)
     if not pkg:
@@ -96,7 +96,6 @@ async def create_order(body: RazorpayCreateOrderRequest):
     if not order_id:
         raise HTTPException(status_code=502, detail="Invalid response from payment gateway.")
 
-    db = await get_database()
     doc = {
         "razorpay_order_id": order_id,
         "package_id": body.package_id,
@@ -120,9 +119,8 @@ async def create_order(body: RazorpayCreateOrderRequest):
 
 
 @router.post("/verify-payment", response_model=RazorpayVerifyResponse)
-async def verify_payment(body: RazorpayVerifyRequest):
+async def verify_payment(body: RazorpayVerifyRequest, db=Depends(get_database)):
     """Verify Razorpay signature and complete the checkout."""
-    db = await get_database()
 
     checkout = await db.advertising_checkouts.find_one(
         {"razorpay_order_id": body.razorpay_order_id}
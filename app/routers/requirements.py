@@ -1,24 +1,24 @@
 """
 Post Your Requirement Screen API - Submit and list property requirements.
 """
-import math
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import Optional
 from bson import ObjectId
 from datetime import datetime
 from app.schemas import Requirement, RequirementCreate
 from app.database import get_database
+from app.object_ids import parse_object_id
+from app.pagination import NEWEST_FIRST, keyset_filter, next_cursor, page_flags
 
 router = APIRouter()
 
 
 @router.post("/", response_model=Requirement, status_code=201)
-async def submit_requirement(data: RequirementCreate):
+async def submit_requirement(data: RequirementCreate, db=Depends(get_database)):
   """
   Post Your Requirement - submit requirement form.
   """
-  db = await get_database()
-  doc = data.dict()
+  doc = data.model_dump()
   doc["status"] = "submitted"
   doc["created_at"] = datetime.utcnow()
   if doc.get("user_id") and ObjectId.is_valid(doc["user_id"]):
@@ -38,28 +38,27 @@ async def get_user_requirements(
   user_id: str,
   page: int = Query(1, ge=1),
   limit: int = Query(20, ge=1, le=100),
+  after: Optional[datetime] = Query(None, description="Keyset cursor: created_at of the last item seen"),
+  after_id: Optional[str] = Query(None, description="Keyset cursor: _id of the last item seen"),
+  db=Depends(get_database),
 ):
   """
   List requirements posted by a user (paginated).
+  Pass after/after_id from next_cursor for keyset pagination; page is ignored then.
   """
-  db = await get_database()
-  if not ObjectId.is_valid(user_id):
-    raise HTTPException(status_code=400, detail="Invalid user ID")
-  query = {"user_id": ObjectId(user_id)}
+  user_oid = parse_object_id(user_id, "user")
+  query = {"user_id": user_oid}
   total = await db.requirements.count_documents(query)
-  skip = (page - 1) * limit
-  cursor = (
-    db.requirements.find(query)
-    .sort("created_at", -1)
-    .skip(skip)
-    .limit(limit)
-  )
-  items = await cursor.to_list(length=limit)
+  keyset = keyset_filter(after, after_id)
+  cursor = db.requirements.find({**query, **keyset} if keyset else query).sort(NEWEST_FIRST)
+  if not keyset:
+    cursor = cursor.skip((page - 1) * limit)
+  items = await cursor.limit(limit).to_list(length=limit)
+  cursor_next = next_cursor(items, limit)
   for doc in items:
     doc["_id"] = str(doc["_id"])
     if doc.get("user_id"):
       doc["user_id"] = str(doc["user_id"])
-  total_pages = math.ceil(total / limit) if total > 0 else 0
   return {
     "success": True,
     "data": {
@@ -67,22 +66,19 @@ async def get_user_requirements(
       "total": total,
       "page": page,
       "limit": limit,
-      "total_pages": total_pages,
-      "has_next": page < total_pages,
-      "has_prev": page > 1,
+      **page_flags(page, limit, total, keyset, cursor_next),
+      "next_cursor": cursor_next,
     },
   }
 
 
 @router.get("/{requirement_id}", response_model=Requirement)
-async def get_requirement(requirement_id: str):
+async def get_requirement(requirement_id: str, db=Depends(get_database)):
   """
   Get a single requirement by ID.
   """
-  db = await get_database()
-  if not ObjectId.is_valid(requirement_id):
-    raise HTTPException(status_code=400, detail="Invalid requirement ID")
-  doc = await db.requirements.find_one({"_id": ObjectId(requirement_id)})
+  requirement_oid = parse_object_id(requirement_id, "requirement")
+  doc = await db.requirements.find_one({"_id": requirement_oid})
   if not doc:
     raise HTTPException(status_code=404, detail="Requirement not found")
   doc["_id"] = str(doc["_id"])
@@ -1,35 +1,32 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
-from bson import ObjectId
 from datetime import datetime
 from app.schemas import Review, ReviewCreate, ReviewUpdate
 from app.database import get_database
+from app.object_ids import parse_object_id
 
 router = APIRouter()
 
 
 @router.post("/", response_model=Review, status_code=201)
-async def create_review(review: ReviewCreate):
+async def create_review(review: ReviewCreate, db=Depends(get_database)):
     """Create a new review"""
-    db = await get_database()
     
     # Validate property exists
-    if not ObjectId.is_valid(review.property_id):
-        raise HTTPException(status_code=400, detail="Invalid property ID")
-    property_exists = await db.properties.find_one({"_id": ObjectId(review.property_id)})
+    property_oid = parse_object_id(review.property_id, "property")
+    property_exists = await db.properties.find_one({"_id": property_oid})
     if not property_exists:
         raise HTTPException(status_code=404, detail="Property not found")
     
     # Validate user exists
-    if not ObjectId.is_valid(review.user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
-    user_exists = await db.users.find_one({"_id": ObjectId(review.user_id)})
+    user_oid = parse_object_id(review.user_id, "user")
+    user_exists = await db.users.find_one({"_id": user_oid})
     if not user_exists:
         raise HTTPException(status_code=404, detail="User not found")
     
     review_dict = review.dict()
-    review_dict["property_id"] = ObjectId(review_dict["property_id"])
-    review_dict["user_id"] = ObjectId(review_dict["user_id"])
+    review_dict["property_id"] = property_oid
+    review_dict["user_id"] = user_oid
     review_dict["created_at"] = datetime.utcnow()
     
     result = await db.reviews.insert_one(review_dict)
@@ -45,21 +42,17 @@ async def get_reviews(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     property_id: Optional[str] = None,
-    user_id: Optional[str] = None
+    user_id: Optional[str] = None,
+    db=Depends(get_database)
 ):
     """Get all reviews with optional filters"""
-    db = await get_database()
     query = {}
     
     if property_id:
-        if not ObjectId.is_valid(property_id):
-            raise HTTPException(status_code=400, detail="Invalid property ID")
-        query["property_id"] = ObjectId(property_id)
+        query["property_id"] = parse_object_id(property_id, "property")
     
     if user_id:
-        if not ObjectId.is_valid(user_id):
-            raise HTTPException(status_code=400, detail="Invalid user ID")
-        query["user_id"] = ObjectId(user_id)
+        query["user_id"] = parse_object_id(user_id, "user")
     
     cursor = db.reviews.find(query).skip(skip).limit(limit).sort("created_at", -1)
     reviews = await cursor.to_list(length=limit)
@@ -73,13 +66,11 @@ async def get_reviews(
 
 
 @router.get("/{review_id}", response_model=Review)
-async def get_review(review_id: str):
+async def get_review(review_id: str, db=Depends(get_database)):
     """Get a specific review by ID"""
-    db = await get_database()
-    if not ObjectId.is_valid(review_id):
-        raise HTTPException(status_code=400, detail="Invalid review ID")
+    review_oid = parse_object_id(review_id, "review")
     
-    review = await db.reviews.find_one({"_id": ObjectId(review_id)})
+    review = await db.reviews.find_one({"_id": review_oid})
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     
@@ -90,11 +81,9 @@ async def get_review(review_id: str):
 
 
 @router.put("/{review_id}", response_model=Review)
-async def update_review(review_id: str, review_update: ReviewUpdate):
+async def update_review(review_id: str, review_update: ReviewUpdate, db=Depends(get_database)):
     """Update a review"""
-    db = await get_database()
-    if not ObjectId.is_valid(review_id):
-        raise HTTPException(status_code=400, detail="Invalid review ID")
+    review_oid = parse_object_id(review_id, "review")
     
     update_data = review_update.dict(exclude_unset=True)
     
@@ -102,14 +91,14 @@ async def update_review(review_id: str, review_update: ReviewUpdate):
         raise HTTPException(status_code=400, detail="No fields to update")
     
     result = await db.reviews.update_one(
-        {"_id": ObjectId(review_id)},
+        {"_id": review_oid},
         {"$set": update_data}
     )
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Review not found")
     
-    updated_review = await db.reviews.find_one({"_id": ObjectId(review_id)})
+    updated_review = await db.reviews.find_one({"_id": review_oid})
     updated_review["_id"] = str(updated_review["_id"])
     updated_review["property_id"] = str(updated_review["property_id"])
     updated_review["user_id"] = str(updated_review["user_id"])
@@ -117,13 +106,11 @@ async def update_review(review_id: str, review_update: ReviewUpdate):
 
 
 @router.delete("/{review_id}", status_code=204)
-async def delete_review(review_id: str):
+async def delete_review(review_id: str, db=Depends(get_database)):
     """Delete a review"""
-    db = await get_database()
-    if not ObjectId.is_valid(review_id):
-        raise HTTPException(status_code=400, detail="Invalid review ID")
+    review_oid = parse_object_id(review_id, "review")
     
-    result = await db.reviews.delete_one({"_id": ObjectId(review_id)})
+    result = await db.reviews.delete_one({"_id": review_oid})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Review not found")
     
@@ -131,13 +118,16 @@ async def delete_review(review_id: str):
 
 
 @router.get("/property/{property_id}", response_model=List[Review])
-async def get_property_reviews(property_id: str):
+async def get_property_reviews(property_id: str, db=Depends(get_database)):
     """Get all reviews for a specific property"""
-    db = await get_database()
-    if not ObjectId.is_valid(property_id):
-        raise HTTPException(status_code=400, detail="Invalid property ID")
+    property_oid = parse_object_id(property_id, "property")
     
-    cursor = db.reviews.find({"property_id": ObjectId(property_id)}).sort("created_at", -1)
+    cursor = (
+        db.reviews.find({"property_id": property_oid})
+        .sort("created_at", -1)
+        .limit(100)
+        .batch_size(100)
+    )
     reviews = await cursor.to_list(length=100)
     
     for review in reviews:
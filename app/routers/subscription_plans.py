@@ -6,12 +6,14 @@ After spin: Platinum = Active Plan, rest = Downgrade. Use POST /activate-spin-re
 iOS: POST /apple/verify-receipt with App Store receipt to unlock plan (Guideline 3.1.1).
 """
 import os
-from fastapi import APIRouter, HTTPException, Query, Body
+from fastapi import APIRouter, HTTPException, Query, Body, Depends
 from typing import List, Optional, Any, Dict
-from bson import ObjectId
 from pydantic import BaseModel
+from pymongo import ReturnDocument
 import aiohttp
 from app.database import get_database
+from app.object_ids import parse_object_id
+from app.services.user_cache import invalidate_user
 
 router = APIRouter()
 
@@ -156,19 +158,19 @@ def _get_plans_with_current(current_plan_id: Optional[str]) -> List[dict]:
     if current not in valid_ids:
         current = "metal"
     for p in SUBSCRIPTION_PLANS:
-        plan = dict(p)
-        plan["is_current"] = plan["id"] == current
-        if plan["is_current"]:
-            plan["button_label"] = "Active Plan"
-        else:
-            plan["button_label"] = "Downgrade"
-        plans.append(plan)
+        is_current = p["id"] == current
+        plans.append({
+            **p,
+            "is_current": is_current,
+            "button_label": "Active Plan" if is_current else "Downgrade",
+        })
     return plans
 
 
 @router.get("/")
 async def get_subscription_plans(
     user_id: Optional[str] = Query(None, description="Optional: get current plan and mark is_current"),
+    db=Depends(get_database),
 ):
     """
     Subscription Plan Screen: Get all subscription plans (Metal, Bronze, Silver, Gold, Platinum).
@@ -176,13 +178,9 @@ async def get_subscription_plans(
     """
     current_plan_id = "metal"
     if user_id:
-        db = await get_database()
-        if ObjectId.is_valid(user_id):
-            user = await db.users.find_one({"_id": ObjectId(user_id)})
-            if user and user.get("subscription_plan_id"):
-                current_plan_id = (user["subscription_plan_id"] or "metal").strip().lower()
-        else:
-            raise HTTPException(status_code=400, detail="Invalid user ID")
+        user = await db.users.find_one({"_id": parse_object_id(user_id, "user")})
+        if user and user.get("subscription_plan_id"):
+            current_plan_id = (user["subscription_plan_id"] or "metal").strip().lower()
 
     plans = _get_plans_with_current(current_plan_id)
     return {
@@ -209,6 +207,7 @@ SPIN_REWARD_PLAN_ID = "platinum"
 @router.post("/activate-spin-reward")
 async def activate_spin_reward(
     user_id: str = Body(..., embed=True, description="Logged-in user ID to activate Platinum plan from spin"),
+    db=Depends(get_database),
 ):
     """
     Activate spin reward: set the user's subscription plan to Platinum (e.g. after spin wheel lands on Platinum).
@@ -216,20 +215,20 @@ async def activate_spin_reward(
     """
     if not user_id or not user_id.strip():
         raise HTTPException(status_code=400, detail="user_id is required")
-    if not ObjectId.is_valid(user_id.strip()):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
-    db = await get_database()
-    uid = ObjectId(user_id.strip())
-    result = await db.users.update_one(
+    uid = parse_object_id(user_id.strip(), "user")
+    updated = await db.users.find_one_and_update(
         {"_id": uid},
         {"$set": {"subscription_plan_id": SPIN_REWARD_PLAN_ID}},
+        projection={"subscription_plan_id": 1},
+        return_document=ReturnDocument.AFTER,
     )
-    if result.matched_count == 0:
+    if not updated:
         raise HTTPException(status_code=404, detail="User not found")
+    invalidate_user(uid)
     return {
         "success": True,
         "data": {
-            "current_plan_id": SPIN_REWARD_PLAN_ID,
+            "current_plan_id": updated["subscription_plan_id"],
             "message": "Platinum plan activated (spin reward).",
         },
     }
@@ -316,15 +315,14 @@ def _plan_id_from_apple_body(data: dict) -> Optional[str]:
 
 
 @router.post("/apple/verify-receipt")
-async def apple_verify_receipt(body: AppleVerifyReceiptBody):
+async def apple_verify_receipt(body: AppleVerifyReceiptBody, db=Depends(get_database)):
     """
     Verify an iOS App Store receipt and set the user's subscription_plan_id.
     Required for Guideline 3.1.1 (digital subscriptions must use In-App Purchase).
     """
     if not body.user_id or not body.user_id.strip():
         raise HTTPException(status_code=400, detail="user_id is required")
-    if not ObjectId.is_valid(body.user_id.strip()):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
+    uid = parse_object_id(body.user_id.strip(), "user")
     if not body.receipt_data or not body.receipt_data.strip():
         raise HTTPException(status_code=400, detail="receipt_data is required")
 
@@ -336,14 +334,13 @@ async def apple_verify_receipt(body: AppleVerifyReceiptBody):
             detail="Could not identify a known subscription product in the App Store receipt",
         )
 
-    db = await get_database()
-    uid = ObjectId(body.user_id.strip())
     result = await db.users.update_one(
         {"_id": uid},
         {"$set": {"subscription_plan_id": plan_id}},
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
+    invalidate_user(uid)
     return {
         "success": True,
         "data": {
@@ -4,7 +4,7 @@ Stores submissions with optional image URL. No authentication required.
 """
 from datetime import datetime
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from app.database import get_database
 from app.schemas import SuccessStory, SuccessStoryCreate
@@ -13,9 +13,8 @@ router = APIRouter()
 
 
 @router.post("/", response_model=SuccessStory, status_code=201)
-async def create_success_story(data: SuccessStoryCreate):
+async def create_success_story(data: SuccessStoryCreate, db=Depends(get_database)):
     """Submit a success story from the website."""
-    db = await get_database()
 
     doc = {
         "first_name": data.first_name.strip(),
@@ -39,14 +38,14 @@ async def create_success_story(data: SuccessStoryCreate):
 
 
 @router.get("/", status_code=200)
-async def list_success_stories(page: int = 1, limit: int = 20):
+async def list_success_stories(page: int = 1, limit: int = 20, db=Depends(get_database)):
     """List success stories (admin use)."""
-    db = await get_database()
     skip = (page - 1) * limit
     cursor = db.success_stories.find().sort("created_at", -1).skip(skip).limit(limit)
     items = []
     async for doc in cursor:
         doc["_id"] = str(doc["_id"])
         items.append(doc)
-    total = await db.success_stories.count_documents({})
+    # Unfiltered list: collection metadata count instead of a full scan.
+    total = await db.success_stories.estimated_document_count()
     return {"total": total, "page": page, "limit": limit, "items": items}
@@ -1,52 +1,65 @@
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
-from bson import ObjectId
 from datetime import datetime
+from pymongo import ReturnDocument
 from app.schemas import Transaction, TransactionCreate, TransactionUpdate
 from app.database import get_database
+from app.object_ids import parse_object_id
+from app.pagination import NEWEST_FIRST, keyset_filter
+from app.responses import MongoJSONResponse
 
 router = APIRouter()
 
+# Fields the Transaction response model reads; keeps reads from pulling whole documents.
+# Model defaults are applied server-side so the list can be returned without re-validation.
+TRANSACTION_PROJECTION = {
+    "property_id": 1,
+    "buyer_id": 1,
+    "seller_id": 1,
+    "transaction_type": 1,
+    "amount": 1,
+    "status": {"$ifNull": ["$status", "pending"]},
+    "created_at": 1,
+    "completed_at": {"$ifNull": ["$completed_at", None]},
+}
+
 
 @router.post("/", response_model=Transaction, status_code=201)
-async def create_transaction(transaction: TransactionCreate):
+async def create_transaction(transaction: TransactionCreate, db=Depends(get_database)):
     """Create a new transaction"""
-    db = await get_database()
     
-    # Validate property exists
-    if not ObjectId.is_valid(transaction.property_id):
-        raise HTTPException(status_code=400, detail="Invalid property ID")
-    property_exists = await db.properties.find_one({"_id": ObjectId(transaction.property_id)})
+    property_oid = parse_object_id(transaction.property_id, "property")
+    buyer_oid = parse_object_id(transaction.buyer_id, "buyer")
+    seller_oid = parse_object_id(transaction.seller_id, "seller")
+    
+    # Validate property, buyer and seller exist: one property lookup and one
+    # users $in lookup, issued concurrently.
+    property_exists, users = await asyncio.gather(
+        db.properties.find_one({"_id": property_oid}, {"_id": 1}),
+        db.users.find({"_id": {"$in": [buyer_oid, seller_oid]}}, {"_id": 1}).to_list(length=2),
+    )
     if not property_exists:
         raise HTTPException(status_code=404, detail="Property not found")
-    
-    # Validate buyer exists
-    if not ObjectId.is_valid(transaction.buyer_id):
-        raise HTTPException(status_code=400, detail="Invalid buyer ID")
-    buyer_exists = await db.users.find_one({"_id": ObjectId(transaction.buyer_id)})
-    if not buyer_exists:
+    found_user_ids = {u["_id"] for u in users}
+    if buyer_oid not in found_user_ids:
         raise HTTPException(status_code=404, detail="Buyer not found")
-    
-    # Validate seller exists
-    if not ObjectId.is_valid(transaction.seller_id):
-        raise HTTPException(status_code=400, detail="Invalid seller ID")
-    seller_exists = await db.users.find_one({"_id": ObjectId(transaction.seller_id)})
-    if not seller_exists:
+    if seller_oid not in found_user_ids:
         raise HTTPException(status_code=404, detail="Seller not found")
     
     transaction_dict = transaction.dict()
-    transaction_dict["property_id"] = ObjectId(transaction_dict["property_id"])
-    transaction_dict["buyer_id"] = ObjectId(transaction_dict["buyer_id"])
-    transaction_dict["seller_id"] = ObjectId(transaction_dict["seller_id"])
+    transaction_dict["property_id"] = property_oid
+    transaction_dict["buyer_id"] = buyer_oid
+    transaction_dict["seller_id"] = seller_oid
     transaction_dict["created_at"] = datetime.utcnow()
     
-    result = await db.transactions.insert_one(transaction_dict)
-    created_transaction = await db.transactions.find_one({"_id": result.inserted_id})
-    created_transaction["_id"] = str(created_transaction["_id"])
-    created_transaction["property_id"] = str(created_transaction["property_id"])
-    created_transaction["buyer_id"] = str(created_transaction["buyer_id"])
-    created_transaction["seller_id"] = str(created_transaction["seller_id"])
-    return created_transaction
+    # insert_one sets transaction_dict["_id"]; no need to read the document back.
+    await db.transactions.insert_one(transaction_dict)
+    transaction_dict["_id"] = str(transaction_dict["_id"])
+    transaction_dict["property_id"] = str(transaction_dict["property_id"])
+    transaction_dict["buyer_id"] = str(transaction_dict["buyer_id"])
+    transaction_dict["seller_id"] = str(transaction_dict["seller_id"])
+    return transaction_dict
 
 
 @router.get("/", response_model=List[Transaction])
@@ -56,50 +69,42 @@ async def get_transactions(
     property_id: Optional[str] = None,
     buyer_id: Optional[str] = None,
     seller_id: Optional[str] = None,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    after: Optional[datetime] = Query(None, description="Keyset cursor: created_at of the last transaction seen"),
+    after_id: Optional[str] = Query(None, description="Keyset cursor: _id of the last transaction seen"),
+    db=Depends(get_database)
 ):
-    """Get all transactions with optional filters"""
-    db = await get_database()
+    """
+    Get all transactions with optional filters, newest first.
+    For keyset pagination pass the last item's created_at/_id as after/after_id; skip is ignored then.
+    """
     query = {}
     
-    if property_id:
-        if not ObjectId.is_valid(property_id):
-            raise HTTPException(status_code=400, detail="Invalid property ID")
-        query["property_id"] = ObjectId(property_id)
-    
-    if buyer_id:
-        if not ObjectId.is_valid(buyer_id):
-            raise HTTPException(status_code=400, detail="Invalid buyer ID")
-        query["buyer_id"] = ObjectId(buyer_id)
-    
-    if seller_id:
-        if not ObjectId.is_valid(seller_id):
-            raise HTTPException(status_code=400, detail="Invalid seller ID")
-        query["seller_id"] = ObjectId(seller_id)
+    for field, value, label in (
+        ("property_id", property_id, "property"),
+        ("buyer_id", buyer_id, "buyer"),
+        ("seller_id", seller_id, "seller"),
+    ):
+        if value:
+            query[field] = parse_object_id(value, label)
     
     if status:
         query["status"] = status
     
-    cursor = db.transactions.find(query).skip(skip).limit(limit).sort("created_at", -1)
-    transactions = await cursor.to_list(length=limit)
-    
-    for transaction in transactions:
-        transaction["_id"] = str(transaction["_id"])
-        transaction["property_id"] = str(transaction["property_id"])
-        transaction["buyer_id"] = str(transaction["buyer_id"])
-        transaction["seller_id"] = str(transaction["seller_id"])
-    
-    return transactions
+    keyset = keyset_filter(after, after_id)
+    cursor = db.transactions.find({**query, **keyset} if keyset else query, TRANSACTION_PROJECTION).sort(NEWEST_FIRST)
+    if not keyset:
+        cursor = cursor.skip(skip)
+    transactions = await cursor.limit(limit).to_list(length=limit)
+    return MongoJSONResponse(transactions)
 
 
 @router.get("/{transaction_id}", response_model=Transaction)
-async def get_transaction(transaction_id: str):
+async def get_transaction(transaction_id: str, db=Depends(get_database)):
     """Get a specific transaction by ID"""
-    db = await get_database()
-    if not ObjectId.is_valid(transaction_id):
-        raise HTTPException(status_code=400, detail="Invalid transaction ID")
+    transaction_oid = parse_object_id(transaction_id, "transaction")
     
-    transaction = await db.transactions.find_one({"_id": ObjectId(transaction_id)})
+    transaction = await db.transactions.find_one({"_id": transaction_oid}, TRANSACTION_PROJECTION)
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
     
@@ -111,11 +116,9 @@ async def get_transaction(transaction_id: str):
 
 
 @router.put("/{transaction_id}", response_model=Transaction)
-async def update_transaction(transaction_id: str, transaction_update: TransactionUpdate):
+async def update_transaction(transaction_id: str, transaction_update: TransactionUpdate, db=Depends(get_database)):
     """Update a transaction"""
-    db = await get_database()
-    if not ObjectId.is_valid(transaction_id):
-        raise HTTPException(status_code=400, detail="Invalid transaction ID")
+    transaction_oid = parse_object_id(transaction_id, "transaction")
     
     update_data = transaction_update.dict(exclude_unset=True)
     
@@ -126,15 +129,16 @@ async def update_transaction(transaction_id: str, transaction_update: Transactio
     if update_data.get("status") == "completed":
         update_data["completed_at"] = datetime.utcnow()
     
-    result = await db.transactions.update_one(
-        {"_id": ObjectId(transaction_id)},
-        {"$set": update_data}
+    updated_transaction = await db.transactions.find_one_and_update(
+        {"_id": transaction_oid},
+        {"$set": update_data},
+        projection=TRANSACTION_PROJECTION,
+        return_document=ReturnDocument.AFTER,
     )
     
-    if result.matched_count == 0:
+    if not updated_transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
     
-    updated_transaction = await db.transactions.find_one({"_id": ObjectId(transaction_id)})
     updated_transaction["_id"] = str(updated_transaction["_id"])
     updated_transaction["property_id"] = str(updated_transaction["property_id"])
     updated_transaction["buyer_id"] = str(updated_transaction["buyer_id"])
@@ -143,13 +147,11 @@ async def update_transaction(transaction_id: str, transaction_update: Transactio
 
 
 @router.delete("/{transaction_id}", status_code=204)
-async def delete_transaction(transaction_id: str):
+async def delete_transaction(transaction_id: str, db=Depends(get_database)):
     """Delete a transaction"""
-    db = await get_database()
-    if not ObjectId.is_valid(transaction_id):
-        raise HTTPException(status_code=400, detail="Invalid transaction ID")
+    transaction_oid = parse_object_id(transaction_id, "transaction")
     
-    result = await db.transactions.delete_one({"_id": ObjectId(transaction_id)})
+    result = await db.transactions.delete_one({"_id": transaction_oid})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Transaction not found")
     
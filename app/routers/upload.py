@@ -2,9 +2,12 @@
 Image upload for property listings.
 Saves under HUNT_UPLOADS_DIR (default: backend/uploads). Same folder must be served at /uploads/ in production (nginx).
 """
+import hashlib
+import os
 import uuid
 from pathlib import Path
 
+import aiofiles
 from fastapi import APIRouter, File, HTTPException, UploadFile
 
 from app.upload_urls import get_uploads_directory, upload_response_payload
@@ -18,6 +21,9 @@ MAX_SIZE_MB = 10
 ALLOWED_DOC_EXTENSIONS = {".pdf", ".doc", ".docx"}
 MAX_DOC_SIZE_MB = 5
 
+# Uploads are streamed to disk in 1 MiB chunks; memory per request stays O(chunk)
+CHUNK_SIZE = 1 << 20
+
 
 def _ensure_uploads_dir():
     get_uploads_directory().mkdir(parents=True, exist_ok=True)
@@ -31,6 +37,27 @@ def _allowed_doc_file(filename: str) -> bool:
     return Path(filename).suffix.lower() in ALLOWED_DOC_EXTENSIONS
 
 
+async def _stream_to_disk(file: UploadFile, file_path: Path, max_size_mb: int) -> str:
+    """
+    Write *file* to *file_path* chunk by chunk, rejecting it as soon as it exceeds *max_size_mb*.
+    Returns the SHA-256 hex digest of the contents.
+    """
+    max_bytes = max_size_mb * 1024 * 1024
+    total = 0
+    digest = hashlib.sha256()
+    async with aiofiles.open(file_path, "wb") as f:
+        while chunk := await file.read(CHUNK_SIZE):
+            total += len(chunk)
+            if total > max_bytes:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"File too large. Max {max_size_mb}MB",
+                )
+            digest.update(chunk)
+            await f.write(chunk)
+    return digest.hexdigest()
+
+
 @router.post("/image")
 async def upload_image(file: UploadFile = File(...)):
     """
@@ -44,23 +71,24 @@ async def upload_image(file: UploadFile = File(...)):
 
     _ensure_uploads_dir()
     ext = Path(file.filename).suffix.lower()
-    unique_name = f"{uuid.uuid4().hex}{ext}"
-    file_path = get_uploads_directory() / unique_name
+    tmp_path = get_uploads_directory() / f"{uuid.uuid4().hex}.part"
 
     try:
-        contents = await file.read()
-        if len(contents) > MAX_SIZE_MB * 1024 * 1024:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large. Max {MAX_SIZE_MB}MB",
-            )
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        digest = await _stream_to_disk(file, tmp_path, MAX_SIZE_MB)
+        # Content-addressed name: identical images are stored once. 32 hex chars keeps the
+        # uuid-shaped filename that app.upload_urls recognises.
+        unique_name = f"{digest[:32]}{ext}"
+        file_path = get_uploads_directory() / unique_name
+        if file_path.exists():
+            tmp_path.unlink(missing_ok=True)
+        else:
+            os.replace(tmp_path, file_path)
     except HTTPException:
+        tmp_path.unlink(missing_ok=True)
         raise
     except Exception as e:
-        if file_path.exists():
-            file_path.unlink(missing_ok=True)
+        if tmp_path.exists():
+            tmp_path.unlink(missing_ok=True)
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
     return upload_response_payload(unique_name)
@@ -84,15 +112,9 @@ async def upload_file(file: UploadFile = File(...)):
     file_path = get_uploads_directory() / unique_name
 
     try:
-        contents = await file.read()
-        if len(contents) > MAX_DOC_SIZE_MB * 1024 * 1024:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large. Max {MAX_DOC_SIZE_MB}MB",
-            )
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        await _stream_to_disk(file, file_path, MAX_DOC_SIZE_MB)
     except HTTPException:
+        file_path.unlink(missing_ok=True)
         raise
     except Exception as e:
         if file_path.exists():
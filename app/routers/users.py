@@ -1,12 +1,18 @@
-from fastapi import APIRouter, HTTPException, Query, Body
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Body, Depends
 from typing import List, Optional
-from bson import ObjectId
 from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from app.schemas import User, UserCreate, UserUpdate
 from app.database import get_database
+from app.object_ids import parse_object_id
+from app.pagination import NEWEST_FIRST, keyset_filter, next_cursor, page_flags
+from app.responses import MongoJSONResponse
+from app.services.passwords import hash_password
+from app.services.user_cache import USER_PROJECTION, get_cached_user, invalidate_user
+from app.text_match import contains_ci
 from app.upload_urls import canonical_client_image_url
-import hashlib
-import math
 
 router = APIRouter()
 
@@ -28,16 +34,52 @@ DELETE_REASON_MAP = {
     },
 }
 
+# Fields search_agents formats into each result row.
+AGENT_SEARCH_PROJECTION = {
+    "name": 1,
+    "email": 1,
+    "phone": 1,
+    "user_type": 1,
+    "city": 1,
+    "dealing_in": 1,
+    "locality": 1,
+    "address": 1,
+    "location.city": 1,
+    "location.address": 1,
+    "avatar_url": 1,
+    "profile_image": 1,
+    "created_at": 1,
+}
+
+# Fields a search_agents city / location term is matched against when falling back to
+# substring search (the text index covers the same fields).
+AGENT_CITY_FIELDS = ("city", "address", "location.city", "dealing_in")
+AGENT_LOCATION_FIELDS = ("address", "locality", "location.locality", "city", "dealing_in")
+
+# Public User fields (never password), with the User model defaults applied server-side
+# so list responses can skip re-validation.
+USER_LIST_PROJECTION = {
+    "name": 1,
+    "email": 1,
+    "phone": {"$ifNull": ["$phone", ""]},
+    "user_type": 1,
+    "avatar_url": {"$ifNull": ["$avatar_url", None]},
+    "subscription_plan_id": {"$ifNull": ["$subscription_plan_id", "metal"]},
+    "created_at": 1,
+}
 
-def hash_password(password: str) -> str:
-    """Simple password hashing (in production, use bcrypt)"""
-    return hashlib.sha256(password.encode()).hexdigest()
+
+def _duplicate_key_detail(exc: DuplicateKeyError) -> str:
+    """Client message for a unique-index violation on users (email or phone)."""
+    key_pattern = (exc.details or {}).get("keyPattern") or {}
+    if "phone" in key_pattern:
+        return "Phone number already registered"
+    return "Email already registered"
 
 
 @router.post("/", response_model=User, status_code=201)
-async def create_user(user: UserCreate):
+async def create_user(user: UserCreate, db=Depends(get_database)):
     """Create a new user"""
-    db = await get_database()
     
     user_dict = user.dict()
     
@@ -52,148 +94,118 @@ async def create_user(user: UserCreate):
     if not user_dict.get("avatar_url"):
         user_dict["avatar_url"] = ""
 
-    # Check if email already exists
-    existing_user = await db.users.find_one({"email": user_dict["email"]})
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    user_dict["password"] = hash_password(user_dict.pop("password"))
+    user_dict["password"] = await hash_password(user_dict.pop("password"))
     user_dict["created_at"] = datetime.utcnow()
     
-    result = await db.users.insert_one(user_dict)
-    created_user = await db.users.find_one({"_id": result.inserted_id})
-    created_user["_id"] = str(created_user["_id"])
-    created_user.pop("password", None)  # Don't return password
-    return created_user
+    # Email uniqueness is enforced by the unique users.email index
+    try:
+        result = await db.users.insert_one(user_dict)
+    except DuplicateKeyError as e:
+        raise HTTPException(status_code=400, detail=_duplicate_key_detail(e))
+    # Build the response from what was inserted instead of reading it back
+    user_dict["_id"] = str(result.inserted_id)
+    user_dict.pop("password", None)  # Don't return password
+    return user_dict
 
 
 @router.get("/", response_model=List[User])
 async def get_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    user_type: Optional[str] = None
+    user_type: Optional[str] = None,
+    db=Depends(get_database)
 ):
     """Get all users with optional filter"""
-    db = await get_database()
     query = {}
     
     if user_type:
         query["user_type"] = user_type
     
-    cursor = db.users.find(query).skip(skip).limit(limit).sort("created_at", -1)
+    cursor = db.users.find(query, USER_LIST_PROJECTION).skip(skip).limit(limit).sort("created_at", -1)
     users = await cursor.to_list(length=limit)
-    
-    for user in users:
-        user["_id"] = str(user["_id"])
-        user.pop("password", None)  # Don't return password
-    
-    return users
+    return MongoJSONResponse(users)
 
 
-@router.get("/{user_id}", response_model=User)
-async def get_user(user_id: str):
-    """Get a specific user by ID"""
-    db = await get_database()
-    if not ObjectId.is_valid(user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
+async def _read_user(user_id: str, db) -> dict:
+    """Shared body of get_user / get_profile: cached read, password never included."""
+    parse_object_id(user_id, "user")
 
-    # Some older records may store `_id` as a string instead of ObjectId.
-    # Try both representations for better compatibility.
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        user = await db.users.find_one({"_id": user_id})
+    user = await get_cached_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    
-    user["_id"] = str(user["_id"])
-    user.pop("password", None)  # Don't return password
     return user
 
 
-@router.get("/profile/{user_id}", response_model=User)
-async def get_profile(user_id: str):
-    """Get a user's profile data for edit profile screen"""
-    db = await get_database()
-    if not ObjectId.is_valid(user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
+@router.get("/{user_id}", response_model=User)
+async def get_user(user_id: str, db=Depends(get_database)):
+    """Get a specific user by ID"""
+    return await _read_user(user_id, db)
 
-    # Compatibility: allow `_id` stored as string in some environments.
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        user = await db.users.find_one({"_id": user_id})
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
 
-    # Convert ObjectId to string and hide password field
-    user["_id"] = str(user["_id"])
-    user.pop("password", None)
-    return user
+@router.get("/profile/{user_id}", response_model=User)
+async def get_profile(user_id: str, db=Depends(get_database)):
+    """Get a user's profile data for edit profile screen"""
+    return await _read_user(user_id, db)
 
 
 @router.put("/{user_id}", response_model=User)
-async def update_user(user_id: str, user_update: UserUpdate):
+async def update_user(user_id: str, user_update: UserUpdate, db=Depends(get_database)):
     """Update a user"""
-    db = await get_database()
-    if not ObjectId.is_valid(user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
+    user_oid = parse_object_id(user_id, "user")
     
     update_data = user_update.dict(exclude_unset=True)
     
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
     
-    # Check if email is being updated and already exists
-    if "email" in update_data:
-        existing_user = await db.users.find_one({"email": update_data["email"]})
-        if existing_user and str(existing_user["_id"]) != user_id:
-            raise HTTPException(status_code=400, detail="Email already registered")
-    
-    result = await db.users.update_one(
-        {"_id": ObjectId(user_id)},
-        {"$set": update_data}
-    )
+    # Email uniqueness is enforced by the unique users.email index
+    try:
+        updated_user = await db.users.find_one_and_update(
+            {"_id": user_oid},
+            {"$set": update_data},
+            projection=USER_PROJECTION,
+            return_document=ReturnDocument.AFTER,
+        )
+    except DuplicateKeyError as e:
+        raise HTTPException(status_code=400, detail=_duplicate_key_detail(e))
     
-    if result.matched_count == 0:
+    if not updated_user:
         raise HTTPException(status_code=404, detail="User not found")
+    invalidate_user(user_id)
     
-    updated_user = await db.users.find_one({"_id": ObjectId(user_id)})
     updated_user["_id"] = str(updated_user["_id"])
-    updated_user.pop("password", None)  # Don't return password
     return updated_user
 
 
 @router.put("/profile/{user_id}", response_model=User)
-async def update_profile(user_id: str, user_update: UserUpdate):
+async def update_profile(user_id: str, user_update: UserUpdate, db=Depends(get_database)):
     """
     Update a user's profile data.
     Intended for the Edit Profile screen – allows updating name, email, phone, and user_type.
     """
-    db = await get_database()
-    if not ObjectId.is_valid(user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
+    user_oid = parse_object_id(user_id, "user")
 
     update_data = user_update.dict(exclude_unset=True)
 
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
 
-    # Check if email is being updated and already exists for another user
-    if "email" in update_data:
-        existing_user = await db.users.find_one({"email": update_data["email"]})
-        if existing_user and str(existing_user["_id"]) != user_id:
-            raise HTTPException(status_code=400, detail="Email already registered")
-
-    result = await db.users.update_one(
-        {"_id": ObjectId(user_id)},
-        {"$set": update_data}
-    )
+    # Email uniqueness (across other users) is enforced by the unique users.email index
+    try:
+        updated_user = await db.users.find_one_and_update(
+            {"_id": user_oid},
+            {"$set": update_data},
+            projection=USER_PROJECTION,
+            return_document=ReturnDocument.AFTER,
+        )
+    except DuplicateKeyError as e:
+        raise HTTPException(status_code=400, detail=_duplicate_key_detail(e))
 
-    if result.matched_count == 0:
+    if not updated_user:
         raise HTTPException(status_code=404, detail="User not found")
+    invalidate_user(user_id)
 
-    updated_user = await db.users.find_one({"_id": ObjectId(user_id)})
     updated_user["_id"] = str(updated_user["_id"])
-    updated_user.pop("password", None)
     return updated_user
 
 
@@ -201,18 +213,15 @@ async def update_profile(user_id: str, user_update: UserUpdate):
 async def delete_user(
     user_id: str,
     payload: Optional[dict] = Body(default=None),
+    db=Depends(get_database),
 ):
     """
     Permanently delete a user account.
     Before deleting the account, mark all owned properties as inactive/unavailable.
     """
-    db = await get_database()
-    if not ObjectId.is_valid(user_id):
-        raise HTTPException(status_code=400, detail="Invalid user ID")
-
-    user_obj_id = ObjectId(user_id)
+    user_obj_id = parse_object_id(user_id, "user")
 
-    existing_user = await db.users.find_one({"_id": user_obj_id})
+    existing_user = await db.users.find_one({"_id": user_obj_id}, {"_id": 1})
     if not existing_user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -248,6 +257,7 @@ async def delete_user(
     user_delete_result = await db.users.delete_one({"_id": user_obj_id})
     if user_delete_result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
+    invalidate_user(user_id)
 
     return {
         "message": "User deleted permanently and properties updated",
@@ -262,68 +272,67 @@ async def search_agents(
     city: Optional[str] = Query(None, description="Filter by city (e.g., Delhi, Noida, Bangalore)"),
     location: Optional[str] = Query(None, description="Search by location/locality"),
     page: int = Query(1, ge=1, description="Page number"),
-    limit: int = Query(20, ge=1, le=100, description="Items per page")
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    after: Optional[datetime] = Query(None, description="Keyset cursor: created_at of the last agent seen"),
+    after_id: Optional[str] = Query(None, description="Keyset cursor: _id of the last agent seen"),
+    db=Depends(get_database)
 ):
     """
     Search Agents - Search for real estate agents.
     Filters users by user_type='agent' or is_real_estate_agent=true.
     Supports filtering by city and location search.
+    Pass after/after_id from next_cursor for keyset pagination; page is ignored then.
     """
-    db = await get_database()
 
     # Must be an agent AND match optional city/location filters
-    agent_filter: dict = {
+    query: dict = {
         "$or": [
             {"user_type": "agent"},
             {"is_real_estate_agent": True},
         ]
     }
-    parts: List[dict] = [agent_filter]
-
-    if city and city.strip():
-        c = city.strip()
-        parts.append(
-            {
-                "$or": [
-                    {"city": {"$regex": c, "$options": "i"}},
-                    {"address": {"$regex": c, "$options": "i"}},
-                    {"location.city": {"$regex": c, "$options": "i"}},
-                    {"dealing_in": {"$regex": c, "$options": "i"}},
-                ]
-            }
+    # City / location go through the users text index (see create_indexes). Each term is
+    # a quoted phrase so both must match, as with the previous per-field regex filters.
+    phrases = [
+        term.replace('"', "").strip()
+        for term in (city, location)
+        if term and term.replace('"', "").strip()
+    ]
+    if phrases:
+        query["$text"] = {"$search": " ".join(f'"{p}"' for p in phrases)}
+
+    # Seek past the cursor when given, else fall back to page/skip
+    keyset = keyset_filter(after, after_id)
+
+    # Fetch the page (newest first) and count all matches concurrently. The cursor is part
+    # of the find filter, so without a text term the (user_type / is_real_estate_agent,
+    # created_at, _id) indexes seek to it instead of sorting the whole match.
+    async def agent_page(match: dict):
+        cursor = db.users.find({"$and": [match, keyset]} if keyset else match, AGENT_SEARCH_PROJECTION)
+        cursor = cursor.sort(NEWEST_FIRST)
+        if not keyset:
+            cursor = cursor.skip((page - 1) * limit)
+        return await asyncio.gather(
+            cursor.limit(limit).to_list(length=limit),
+            db.users.count_documents(match),
         )
-
-    if location and location.strip():
-        loc = location.strip()
-        parts.append(
-            {
-                "$or": [
-                    {"address": {"$regex": loc, "$options": "i"}},
-                    {"locality": {"$regex": loc, "$options": "i"}},
-                    {"location.locality": {"$regex": loc, "$options": "i"}},
-                    {"city": {"$regex": loc, "$options": "i"}},
-                    {"dealing_in": {"$regex": loc, "$options": "i"}},
-                ]
-            }
-        )
-
-    query: dict = {"$and": parts} if len(parts) > 1 else agent_filter
-    
-    # Count total agents
-    total = await db.users.count_documents(query)
-    
-    # Calculate pagination
-    skip = (page - 1) * limit
-    
-    # Fetch agents
-    cursor = (
-        db.users.find(query)
-        .skip(skip)
-        .limit(limit)
-        .sort("created_at", -1)  # Sort by newest first
-    )
-    
-    agents = await cursor.to_list(length=limit)
+    agents, total = await agent_page(query)
+
+    # $text only matches whole words; when it finds nothing, retry as case-insensitive
+    # substrings so partial terms ("Raj" -> "Rajesh") still find agents.
+    if phrases and not total:
+        terms = [
+            (term.strip(), fields)
+            for term, fields in ((city, AGENT_CITY_FIELDS), (location, AGENT_LOCATION_FIELDS))
+            if term and term.strip()
+        ]
+        fallback = {k: v for k, v in query.items() if k != "$text"}
+        fallback["$and"] = [
+            {"$or": [{field: contains_ci(term)} for field in fields]}
+            for term, fields in terms
+        ]
+        agents, total = await agent_page(fallback)
+    cursor_next = next_cursor(agents, limit)
     
     # Format response
     formatted_agents = []
@@ -369,24 +378,21 @@ async def search_agents(
             "operating_since": operating_since or "2020",
             "avatar_url": avatar,
             "user_type": agent.get("user_type", "agent"),
-            "created_at": agent.get("created_at").isoformat() if agent.get("created_at") else None
+            "created_at": agent.get("created_at"),  # orjson writes datetimes as ISO 8601
         }
         formatted_agents.append(formatted_agent)
     
-    total_pages = math.ceil(total / limit) if total > 0 else 0
-    
-    return {
+    return MongoJSONResponse({
         "success": True,
         "data": {
             "agents": formatted_agents,
             "total": total,
             "page": page,
             "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
+            **page_flags(page, limit, total, keyset, cursor_next),
+            "next_cursor": cursor_next,
         }
-    }
+    })
 
 
 
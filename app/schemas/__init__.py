@@ -1,47 +1,159 @@
-from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_serializer
-from pydantic_core import core_schema
-from typing import Optional, List, Annotated, Union, Literal
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, computed_field, field_serializer, field_validator
+from pydantic import NaiveDatetime, PlainSerializer, PlainValidator, StringConstraints, TypeAdapter, WithJsonSchema, create_model
+from pydantic.dataclasses import dataclass
+from pydantic.fields import FieldInfo
+from typing import Any, Optional, List, Tuple, Annotated, Union, Literal
 from datetime import datetime
+import sys
 from bson import ObjectId
+from bson.errors import InvalidId
 
 
-class PyObjectId(ObjectId):
-    @classmethod
-    def __get_pydantic_core_schema__(
-        cls, source_type, handler
-    ) -> core_schema.CoreSchema:
-        return core_schema.union_schema([
-            core_schema.is_instance_schema(ObjectId),
-            core_schema.no_info_after_validator_function(
-                cls._validate_str,
-                core_schema.str_schema(),
-            ),
-        ])
-    
-    @classmethod
-    def _validate_str(cls, v: str) -> ObjectId:
-        if ObjectId.is_valid(v):
+def _to_object_id(v: Any) -> ObjectId:
+    if isinstance(v, ObjectId):
+        return v
+    if isinstance(v, str):
+        # ObjectId() parses and validates the hex in one pass
+        try:
             return ObjectId(v)
-        raise ValueError("Invalid ObjectId string")
-    
-    def __str__(self):
-        return str(ObjectId(self))
+        except InvalidId:
+            pass
+    raise ValueError("Invalid ObjectId string")
+
+
+def _object_id_to_str(v: ObjectId) -> str:
+    # A named function: PlainSerializer inspects its signature, which builtin `str` lacks
+    return str(v)
+
+
+# ObjectId field: accepts an ObjectId or its 24-char hex string, emits the hex string in JSON
+PyObjectId = Annotated[
+    ObjectId,
+    PlainValidator(_to_object_id),
+    PlainSerializer(_object_id_to_str, return_type=str, when_used="json"),
+    WithJsonSchema({"type": "string"}),
+]
+
+
+def make_partial(model: type, name: str, exclude: tuple = (), **extra_fields) -> type:
+    """
+    Update-model variant of *model*: every field optional (default None), constraints and
+    descriptions kept, unknown keys rejected. Use with model_dump(exclude_unset=True).
+    """
+    fields = {
+        field_name: (Optional[info.annotation], FieldInfo.merge_field_infos(info, default=None))
+        for field_name, info in model.model_fields.items()
+        if field_name not in exclude
+    }
+    return create_model(name, __config__=ConfigDict(extra="forbid"), **fields, **extra_fields)
+
+
+# Shared model configs: stored documents come back keyed by `_id` (aliased to `id`).
+# Response models are only validated through FastAPI's response_model adapters (which
+# inline their core schema), so their own validator/serializer is built on first direct
+# use rather than at import.
+RESPONSE_CONFIG = ConfigDict(populate_by_name=True, defer_build=True)
+# Read-only responses built straight from Mongo documents
+FROZEN_RESPONSE_CONFIG = ConfigDict(populate_by_name=True, frozen=True, defer_build=True)
+
+
+# Enumerated string/int fields. Applied to the Create/Update (input) models only: response
+# models keep the stored types, so documents with legacy values still read back.
+TransactionType = Literal["rent", "sale"]
+Furnishing = Literal["furnished", "semi-furnished", "unfurnished"]
+Facing = Literal[
+    "North", "East", "West", "South",
+    "North-East", "South-East", "North-West", "South-West",
+]
+OpenSides = Literal[1, 2, 3, 4]
+UserType = Literal["owner", "buyer", "agent"]
+ContactPreference = Literal["phone", "email"]
+InquiryStatus = Literal["pending", "responded", "completed", "closed"]
+TransactionStatus = Literal["pending", "completed", "cancelled"]
+# Notification types by Notification Screen tab (the "all" tab also shows "system")
+PROPERTY_ALERT_TYPES = (
+    "price_drop", "new_listing", "plot_available", "price_alert",
+    "favorite", "inquiry", "listing_approved", "property_alert",
+)
+PLAN_TYPES = ("subscription", "plan", "plan_expiring")
+NotificationType = Literal[PROPERTY_ALERT_TYPES + PLAN_TYPES + ("system",)]
+
+# Syntactic email check run entirely in pydantic-core, for the user signup/update request
+# models (User responses read stored emails back as plain str).
+# Standalone forms (home loan, NRI, careers, ...) keep the stricter EmailStr.
+Email = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, max_length=254, pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$"),
+]
+
+# WGS84 coordinate ranges (GeoJSON order is [longitude, latitude]). For request models and
+# query params only; stored points predating the check are read back unchecked.
+Longitude = Annotated[float, Field(ge=-180, le=180)]
+Latitude = Annotated[float, Field(ge=-90, le=90)]
+
+
+# Page/limit pagination envelope: total_pages, has_next and has_prev are derived, not stored
+class PagedResponse(BaseModel):
+    total: int
+    page: int
+    limit: int
+
+    @computed_field
+    @property
+    def total_pages(self) -> int:
+        # Integer ceil division; 0 when there are no results
+        return -(-self.total // self.limit)
+
+    @computed_field
+    @property
+    def has_next(self) -> bool:
+        return self.page * self.limit < self.total
+
+    @computed_field
+    @property
+    def has_prev(self) -> bool:
+        return self.page > 1
+
+
+# GeoJSON Point Schema (request side, via LocationCreate)
+class GeoJSONPoint(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    type: Literal["Point"] = "Point"
+    coordinates: Tuple[Longitude, Latitude] = Field(..., description="[longitude, latitude]")
 
 
-# Location Schema
-class Location(BaseModel):
+# Location Schema (nested rows are slotted dataclasses: no per-instance __dict__)
+@dataclass(slots=True, frozen=True)
+class Location:
     address: str
     locality: str
     city: str
+    # Stored points are read back as-is: one off-shape legacy geo must not fail a whole page
     geo: dict = Field(..., description="GeoJSON Point: {type: 'Point', coordinates: [longitude, latitude]}")
 
 
+# Request-side Location, with length caps (stored locations are read back uncapped)
+@dataclass(slots=True, frozen=True)
+class LocationCreate:
+    address: str = Field(..., max_length=500)
+    locality: str = Field(..., max_length=100)
+    city: str = Field(..., max_length=100)
+    geo: GeoJSONPoint = Field(..., description="GeoJSON Point: {type: 'Point', coordinates: [longitude, latitude]}")
+
+
 # Image Schema
-class Image(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Image:
     url: str
     is_primary: bool = False
 
 
+@dataclass(slots=True, frozen=True)
+class ImageCreate:
+    url: str = Field(..., max_length=2048)
+    is_primary: bool = False
+
+
 # Property Schemas
 class PropertyBase(BaseModel):
     # Basic info (maps to Step 1 - User & Property Info from UI)
@@ -160,50 +272,46 @@ class PropertyBase(BaseModel):
         description="Optional note by owner when reason is changed_mind",
     )
 
+    @field_validator("amenities")
+    @classmethod
+    def _intern_amenities(cls, v: List[str]) -> List[str]:
+        # The same few amenity names repeat across every listing; share one str object each
+        return [sys.intern(a) for a in v]
+
 
 class PropertyCreate(PropertyBase):
     owner_id: str
-
-
-class PropertyUpdate(BaseModel):
-    title: Optional[str] = None
-    description: Optional[str] = None
-    transaction_type: Optional[str] = None
-    price: Optional[float] = None
-    property_category: Optional[str] = None
-    property_subtype: Optional[str] = None
-    bedrooms: Optional[int] = None
-    bathrooms: Optional[int] = None
-    balconies: Optional[int] = None
-    area_sqft: Optional[float] = None
-    furnishing: Optional[str] = None
-    floor_number: Optional[int] = None
-    total_floors: Optional[int] = None
-    floors_allowed: Optional[int] = None
-    open_sides: Optional[int] = None
-    facing: Optional[str] = None
-    store_room: Optional[bool] = None
-    servant_room: Optional[bool] = None
-    possession_status: Optional[str] = None
-    availability_month: Optional[int] = Field(None, ge=1, le=12)
-    availability_year: Optional[int] = Field(None, ge=2000, le=2100)
-    age_of_construction: Optional[str] = None
-    location: Optional[Location] = None
-    images: Optional[List[Image]] = None
-    amenities: Optional[List[str]] = None
-    listing_status: Optional[str] = Field(None, description="active, pending, or rejected")
-    view_count: Optional[int] = None
+    transaction_type: TransactionType = Field(..., description="rent or sale - corresponds to 'Property For' in UI")
+    furnishing: Furnishing = Field(..., description="furnished, semi-furnished, or unfurnished")
+    open_sides: Optional[OpenSides] = Field(default=None, description="Number of open sides: 1, 2, 3, or 4")
+    facing: Optional[Facing] = Field(default=None, description="Facing of property (e.g. North, South-East)")
+    # Sanity bounds for new/edited listings (stored listings are read back unbounded)
+    title: str = Field(..., max_length=200)
+    description: str = Field(..., max_length=5000)
+    location: LocationCreate
+    images: List[ImageCreate] = []
+    price: float = Field(..., ge=0, le=1e12)
+    bedrooms: int = Field(..., ge=0, le=50)
+    bathrooms: int = Field(..., ge=0, le=50)
+    balconies: Optional[int] = Field(default=None, ge=0, le=20)
+    area_sqft: float = Field(..., ge=0, le=1e7)
+    floor_number: Optional[int] = Field(default=None, ge=-5, le=200, description="Current floor number of the property")
+    total_floors: Optional[int] = Field(default=None, ge=0, le=200, description="Total number of floors in the building")
+
+
+PropertyUpdate = make_partial(
+    PropertyCreate,
+    "PropertyUpdate",
+    # owner_id is fixed at creation; the rest are set only by the delete/removal flow
+    exclude=("owner_id", "availability_status", "availability_message", "removal_reason", "removal_note"),
+)
 
 
 class Property(PropertyBase):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str}
-    )
+    model_config = FROZEN_RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
     owner_id: PyObjectId
-    posted_at: datetime
+    posted_at: NaiveDatetime
     # My Listing response: saves = count of users who favorited this property (computed, not stored)
     saves: Optional[int] = Field(default=None, description="Favorite/save count (computed for My Listing)")
 
@@ -221,7 +329,7 @@ class PropertyDeleteActionRequest(BaseModel):
     )
 class UserBase(BaseModel):
     name: str
-    email: EmailStr
+    email: str
     # Phone is optional here so that Google sign-in users can be
     # created without a phone and attach/verify it later via OTP.
     phone: Optional[str] = Field(
@@ -241,30 +349,28 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase):
     password: str
+    email: Email
+    user_type: UserType = Field(..., description="owner, buyer, or agent")
+    phone: Optional[str] = Field(
+        default="",
+        max_length=20,
+        description="Primary phone number. May be empty for social-login users until verified.",
+    )
 
 
-class UserUpdate(BaseModel):
-    name: Optional[str] = None
-    email: Optional[EmailStr] = None
-    phone: Optional[str] = None
-    alt_phone: Optional[str] = Field(None, description="Alternate mobile number")
-    aadhar_number: Optional[str] = Field(None, description="Aadhar identification number")
-    user_type: Optional[str] = None
-    avatar_url: Optional[str] = None
-    subscription_plan_id: Optional[str] = Field(
-        None,
-        description="Subscription plan: metal, bronze, silver, gold, platinum",
-    )
+UserUpdate = make_partial(
+    UserCreate,
+    "UserUpdate",
+    exclude=("password",),
+    alt_phone=(Optional[str], Field(None, description="Alternate mobile number")),
+    aadhar_number=(Optional[str], Field(None, description="Aadhar identification number")),
+)
 
 
 class User(UserBase):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str}
-    )
+    model_config = FROZEN_RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
-    created_at: datetime
+    created_at: NaiveDatetime
 
 
 # Review Schemas
@@ -276,22 +382,19 @@ class ReviewBase(BaseModel):
 
 
 class ReviewCreate(ReviewBase):
-    pass
+    comment: str = Field(..., max_length=2000)
 
 
 class ReviewUpdate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
     rating: Optional[int] = Field(None, ge=1, le=5)
-    comment: Optional[str] = None
+    comment: Optional[str] = Field(None, max_length=2000)
 
 
 class Review(ReviewBase):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str}
-    )
+    model_config = FROZEN_RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
-    created_at: datetime
+    created_at: NaiveDatetime
 
 
 # Inquiry Schemas
@@ -307,24 +410,22 @@ class InquiryBase(BaseModel):
 
 
 class InquiryCreate(InquiryBase):
-    pass
+    message: str = Field(..., max_length=2000)
+    contact_preference: ContactPreference = Field(..., description="phone or email")
 
 
 class InquiryUpdate(BaseModel):
-    message: Optional[str] = None
-    contact_preference: Optional[str] = None
-    status: Optional[str] = Field(None, description="pending, responded, closed")
+    model_config = ConfigDict(extra="forbid")
+    message: Optional[str] = Field(None, max_length=2000)
+    contact_preference: Optional[ContactPreference] = None
+    status: Optional[InquiryStatus] = Field(None, description="pending, responded, completed, closed")
 
 
 class Inquiry(InquiryBase):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str}
-    )
+    model_config = FROZEN_RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
     status: str = "pending"
-    created_at: datetime
+    created_at: NaiveDatetime
 
 
 # Favorite Schemas
@@ -338,13 +439,9 @@ class FavoriteCreate(FavoriteBase):
 
 
 class Favorite(FavoriteBase):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str}
-    )
+    model_config = FROZEN_RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
-    created_at: datetime
+    created_at: NaiveDatetime
 
 
 # Transaction Schemas
@@ -358,23 +455,22 @@ class TransactionBase(BaseModel):
 
 
 class TransactionCreate(TransactionBase):
-    pass
+    transaction_type: TransactionType = Field(..., description="rent or sale")
+    status: TransactionStatus = Field(default="pending", description="pending, completed, cancelled")
+    amount: float = Field(..., ge=0, le=1e12)
 
 
 class TransactionUpdate(BaseModel):
-    status: Optional[str] = None
-    amount: Optional[float] = None
+    model_config = ConfigDict(extra="forbid")
+    status: Optional[TransactionStatus] = None
+    amount: Optional[float] = Field(None, ge=0, le=1e12)
 
 
 class Transaction(TransactionBase):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str}
-    )
+    model_config = FROZEN_RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
-    created_at: datetime
-    completed_at: Optional[datetime] = None
+    created_at: NaiveDatetime
+    completed_at: Optional[NaiveDatetime] = None
 
 
 # Notification Schemas (Notification Screen)
@@ -408,7 +504,8 @@ class NotificationBase(BaseModel):
 
 
 class NotificationCreate(NotificationBase):
-    pass
+    # New notifications must use a known type; stored ones are read back as plain str
+    type: NotificationType = Field(..., description="Notification type (selects the UI tab)")
 
 
 class NotificationUpdate(BaseModel):
@@ -418,34 +515,26 @@ class NotificationUpdate(BaseModel):
 
 
 class Notification(NotificationBase):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str}
-    )
+    model_config = RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
     created_at: datetime
 
 
-class NotificationListResponse(BaseModel):
+class NotificationListResponse(PagedResponse):
     notifications: List[Notification]
-    total: int
-    page: int
-    limit: int
-    total_pages: int
-    has_next: bool
-    has_prev: bool
     unread_count: int = Field(..., description="Total unread count for badge")
 
 
 # Search Schemas
 class GeoSearchParams(BaseModel):
-    longitude: float
-    latitude: float
-    max_distance: int = Field(default=5000, description="Maximum distance in meters")
+    model_config = ConfigDict(extra="forbid")
+    longitude: Longitude
+    latitude: Latitude
+    max_distance: int = Field(default=5000, ge=1, description="Maximum distance in meters")
 
 
 class PropertySearchParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
     transaction_type: Optional[str] = None
     min_price: Optional[float] = None
     max_price: Optional[float] = None
@@ -459,14 +548,23 @@ class PropertySearchParams(BaseModel):
 
 
 # Paginated Response Schema for Property Listing
-class PropertyListResponse(BaseModel):
+class PropertyListResponse(PagedResponse):
     properties: List[Property]
-    total: int
-    page: int
-    limit: int
-    total_pages: int
-    has_next: bool
-    has_prev: bool
+
+
+
+# Built once at import; reused for every List[Property] response (see routers/properties.py)
+PROPERTY_LIST_ADAPTER = TypeAdapter(List[Property])
+
+
+def validate_property_list(docs: List[dict]) -> List[Property]:
+    """Validate a page of raw property documents in one pydantic-core call."""
+    return PROPERTY_LIST_ADAPTER.validate_python(docs)
+
+
+def dump_property_list_json(items: List[Property]) -> bytes:
+    """JSON bytes (by alias, so `_id`) for validated properties, written by pydantic-core."""
+    return PROPERTY_LIST_ADAPTER.dump_json(items, by_alias=True)
 
 
 # Order Schemas (Order History Screen)
@@ -491,25 +589,15 @@ class OrderUpdate(BaseModel):
 
 
 class Order(OrderBase):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str}
-    )
+    model_config = RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
     order_number: Optional[str] = None
     created_at: datetime
     title: Optional[str] = Field(None, description="Display title for Order History card e.g. Owner-Gold -3500 / 114107135936")
 
 
-class OrderListResponse(BaseModel):
+class OrderListResponse(PagedResponse):
     orders: List[Order]
-    total: int
-    page: int
-    limit: int
-    total_pages: int
-    has_next: bool
-    has_prev: bool
 
 
 # Home Loan Application Schemas (Home Loan Screen)
@@ -529,11 +617,7 @@ class HomeLoanApplicationCreate(HomeLoanApplicationBase):
 
 
 class HomeLoanApplication(HomeLoanApplicationBase):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str}
-    )
+    model_config = RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
     user_id: Optional[str] = None
     status: str = Field(default="submitted", description="submitted, contacted, in_progress, approved, rejected")
@@ -541,7 +625,8 @@ class HomeLoanApplication(HomeLoanApplicationBase):
 
 
 # Property Cost Calculator (Property Cost Screen)
-class AnnexureRowSchema(BaseModel):
+@dataclass(slots=True, frozen=True)
+class AnnexureRowSchema:
     name: str
     price: float = Field(0, ge=0)
     units: float = Field(0, ge=0)
@@ -574,11 +659,7 @@ class PropertyCostCalculationCreate(PropertyCostCalculationBase):
 
 
 class PropertyCostCalculation(PropertyCostCalculationBase):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str}
-    )
+    model_config = RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
     user_id: Optional[str] = None
     grand_total: float = Field(0, ge=0)
@@ -601,11 +682,7 @@ class NRIQueryCreate(NRIQueryBase):
 
 
 class NRIQuery(NRIQueryBase):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str}
-    )
+    model_config = RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
     user_id: Optional[str] = None
     created_at: datetime
@@ -670,11 +747,7 @@ class RequirementCreate(RequirementBase):
 
 
 class Requirement(RequirementBase):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str}
-    )
+    model_config = RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
     user_id: Optional[str] = None
     status: str = Field(
@@ -709,11 +782,7 @@ class AgentContactLeadCreate(BaseModel):
 
 
 class AgentContactLead(BaseModel):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str},
-    )
+    model_config = RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
     agent_id: Optional[str] = None
     agent_name: str
@@ -740,11 +809,7 @@ class ChannelPartnerApplicationCreate(BaseModel):
 
 
 class ChannelPartnerApplication(BaseModel):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str},
-    )
+    model_config = RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
     full_name: str
     mobile: str
@@ -774,11 +839,7 @@ class CareerApplicationCreate(BaseModel):
 
 
 class CareerApplication(BaseModel):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str},
-    )
+    model_config = RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
     first_name: str
     last_name: str
@@ -812,11 +873,7 @@ class SuccessStoryCreate(BaseModel):
 
 
 class SuccessStory(BaseModel):
-    model_config = ConfigDict(
-        populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str},
-    )
+    model_config = RESPONSE_CONFIG
     id: Optional[PyObjectId] = Field(None, alias="_id")
     first_name: str
     last_name: str
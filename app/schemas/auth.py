@@ -1,6 +1,8 @@
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field
 from typing import Optional
 
+from app.schemas import Email
+
 
 class RequestOTPRequest(BaseModel):
     phone_number: str = Field(..., description="Phone number with country code (e.g., +918881675561)")
@@ -25,7 +27,7 @@ class VerifyOTPResponse(BaseModel):
 class SignupRequest(BaseModel):
     phone_number: str = Field(..., description="Phone number (must be OTP verified)")
     full_name: str = Field(..., min_length=2, description="Full name of the user")
-    email: Optional[EmailStr] = Field(None, description="Email address of the user")
+    email: Optional[Email] = Field(None, description="Email address of the user")
     is_real_estate_agent: bool = Field(default=False, description="Whether user is a real estate agent")
     user_type: Optional[str] = Field(None, description="User type: owner, buyer, agent, or user")
     terms_accepted: bool = Field(..., description="Must be true to accept terms and conditions")
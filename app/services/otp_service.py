@@ -1,25 +1,90 @@
-import random
+import hmac
+import logging
+import secrets
 import asyncio
 import aiohttp
 from datetime import datetime, timedelta
 from typing import Optional, Dict
-from urllib.parse import quote
 import os
+import time
+from cachetools import TLRUCache
+from fastapi import HTTPException
+from pymongo import ReturnDocument
 from app.database import get_database
 
-# In-memory OTP storage (in production, use Redis or MongoDB)
-otp_storage: Dict[str, Dict] = {}
+logger = logging.getLogger(__name__)
+
+# In-process fallback for the MongoDB `otps` collection, which is the store shared across
+# workers. Each entry is evicted at its own expires_at, so abandoned OTPs don't accumulate.
+otp_storage: Dict[str, Dict] = TLRUCache(
+    maxsize=100_000,
+    ttu=lambda _phone, data, _now: data["expires_at"],
+    timer=datetime.utcnow,
+)
+
+# Caps in-flight SMS gateway calls (matches the session's limit_per_host) so a signup
+# burst queues here instead of tripping the gateway's rate limit
+_sms_semaphore = asyncio.Semaphore(int(os.getenv("SMS_MAX_CONCURRENCY", "20")))
+
+# Per-phone OTP send limit: at most OTP_SEND_LIMIT sends per fixed OTP_SEND_WINDOW_SECONDS window
+OTP_SEND_LIMIT = int(os.getenv("OTP_SEND_LIMIT", "5"))
+OTP_SEND_WINDOW_SECONDS = int(os.getenv("OTP_SEND_WINDOW_SECONDS", "300"))
 
 
 class OTPService:
-    # SMS API Configuration (NimbusIT)
-    SMS_BASE_URL = "http://nimbusit.biz/api/SmsApi/SendSingleApi"
-    SMS_USER_ID = "catalystepages"
-    SMS_PASSWORD = "!pnLqoC7"
-    SMS_SENDER_ID = "HNTPRP"
-    SMS_ENTITY_ID = "1701176925982555502"
-    SMS_TEMPLATE_ID_LOGIN = "1707177070006589173"
-    SMS_TEMPLATE_ID_SIGNUP = "1707177070067885672"
+    # SMS API Configuration (NimbusIT), read once at import from the environment only.
+    # Without the account settings below, SMS sending is disabled (logged at startup).
+    SMS_BASE_URL = os.getenv("SMS_BASE_URL", "http://nimbusit.biz/api/SmsApi/SendSingleApi").strip()
+    SMS_USER_ID = os.getenv("SMS_USER_ID", "").strip()
+    SMS_PASSWORD = os.getenv("SMS_PASSWORD", "").strip()
+    SMS_SENDER_ID = os.getenv("SMS_SENDER_ID", "").strip()
+    SMS_ENTITY_ID = os.getenv("SMS_ENTITY_ID", "").strip()
+    SMS_TEMPLATE_ID_LOGIN = os.getenv("SMS_TEMPLATE_ID_LOGIN", "").strip()
+    SMS_TEMPLATE_ID_SIGNUP = os.getenv("SMS_TEMPLATE_ID_SIGNUP", "").strip()
+    SMS_REQUIRED_ENV = {
+        "SMS_USER_ID": SMS_USER_ID,
+        "SMS_PASSWORD": SMS_PASSWORD,
+        "SMS_SENDER_ID": SMS_SENDER_ID,
+        "SMS_ENTITY_ID": SMS_ENTITY_ID,
+        "SMS_TEMPLATE_ID_LOGIN": SMS_TEMPLATE_ID_LOGIN,
+        "SMS_TEMPLATE_ID_SIGNUP": SMS_TEMPLATE_ID_SIGNUP,
+    }
+    SMS_MISSING_ENV = [name for name, value in SMS_REQUIRED_ENV.items() if not value]
+    # Query params that are the same on every send; aiohttp encodes them with the per-call ones
+    SMS_BASE_PARAMS = {
+        "UserID": SMS_USER_ID,
+        "Password": SMS_PASSWORD,
+        "SenderID": SMS_SENDER_ID,
+        "EntityID": SMS_ENTITY_ID,
+    }
+    # Message texts must match the DLT-registered templates above
+    SMS_MSG_LOGIN = "Use OTP {otp} to log in to your Hunt property account. This OTP is valid for 5 minutes. Do not share it with anyone."
+    SMS_MSG_SIGNUP = "Use OTP {otp} to complete your Hunt property signup. OTP is valid for 5 minutes. Do not share it with anyone."
+
+    # One pooled HTTP session for all SMS calls (opened/closed with the app)
+    _session: Optional[aiohttp.ClientSession] = None
+
+    @staticmethod
+    async def init_session():
+        """Open the shared SMS client session (call at app startup)."""
+        if OTPService.SMS_MISSING_ENV:
+            logger.error(
+                "SMS gateway not configured (missing %s); OTP SMS sending is disabled",
+                ", ".join(OTPService.SMS_MISSING_ENV),
+            )
+        if OTPService._session is None or OTPService._session.closed:
+            connector = aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=60)
+            OTPService._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=10),
+            )
+
+    @staticmethod
+    async def close_session():
+        """Close the shared SMS client session (call at app shutdown)."""
+        if OTPService._session is not None:
+            await OTPService._session.close()
+            OTPService._session = None
 
     @staticmethod
     def _is_apple_review_phone(phone_number: str) -> bool:
@@ -37,9 +102,10 @@ class OTPService:
                 tail = value[-2:] if len(value) >= 2 else value
                 return f"<len={len(value)}>*{tail}"
 
-            print(
-                "ℹ️ APPLE_REVIEW_PHONE configured but did not match. "
-                f"configured={_mask(configured)} incoming={_mask(incoming)}"
+            logger.debug(
+                "APPLE_REVIEW_PHONE configured but did not match. configured=%s incoming=%s",
+                _mask(configured),
+                _mask(incoming),
             )
         return matched
 
@@ -60,10 +126,15 @@ class OTPService:
         # Keep it sane even if misconfigured
         return max(1, min(days, 365))
     
+    @staticmethod
+    def _otp_matches(expected: str, given: str) -> bool:
+        """Constant-time OTP comparison (bytes, so non-ASCII input can't raise)."""
+        return hmac.compare_digest(str(expected).encode(), str(given).encode())
+
     @staticmethod
     def generate_otp(length: int = 6) -> str:
-        """Generate a random OTP"""
-        return str(random.randint(10**(length-1), 10**length - 1))
+        """Generate a random OTP (CSPRNG, zero-padded so every length-digit code is possible)"""
+        return f"{secrets.randbelow(10**length):0{length}d}"
     
     @staticmethod
     async def send_sms_via_nimbus(phone_number: str, otp: str, is_login: bool = False) -> bool:
@@ -71,50 +142,74 @@ class OTPService:
         Send OTP via NimbusIT SMS API.
         Returns True if SMS sent successfully, False otherwise.
         """
+        if OTPService.SMS_MISSING_ENV:
+            logger.error("SMS not sent to %s: SMS gateway not configured", phone_number)
+            return False
         try:
             # Remove + from phone number for SMS API (or keep it, depending on API requirements)
             phone_clean = phone_number.replace("+", "")
             
-            # Select template based on login or signup
-            template_id = OTPService.SMS_TEMPLATE_ID_LOGIN if is_login else OTPService.SMS_TEMPLATE_ID_SIGNUP
-            
-            # Build SMS message based on login or signup
+            # Select template and message based on login or signup
             if is_login:
-                msg = f"Use OTP {otp} to log in to your Hunt property account. This OTP is valid for 5 minutes. Do not share it with anyone."
+                template_id = OTPService.SMS_TEMPLATE_ID_LOGIN
+                msg = OTPService.SMS_MSG_LOGIN.format(otp=otp)
             else:
-                msg = f"Use OTP {otp} to complete your Hunt property signup. OTP is valid for 5 minutes. Do not share it with anyone."
-            
-            # Build SMS API URL (URL encode the message)
-            url = (
-                f"{OTPService.SMS_BASE_URL}?"
-                f"UserID={OTPService.SMS_USER_ID}&"
-                f"Password={OTPService.SMS_PASSWORD}&"
-                f"SenderID={OTPService.SMS_SENDER_ID}&"
-                f"Phno={phone_clean}&"
-                f"Msg={quote(msg)}&"
-                f"EntityID={OTPService.SMS_ENTITY_ID}&"
-                f"TemplateID={template_id}"
-            )
+                template_id = OTPService.SMS_TEMPLATE_ID_SIGNUP
+                msg = OTPService.SMS_MSG_SIGNUP.format(otp=otp)
+            params = {**OTPService.SMS_BASE_PARAMS, "Phno": phone_clean, "Msg": msg, "TemplateID": template_id}
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if OTPService._session is None or OTPService._session.closed:
+                await OTPService.init_session()
+            async with _sms_semaphore:
+                async with OTPService._session.get(OTPService.SMS_BASE_URL, params=params) as response:
                     if response.status == 200:
                         result = await response.text()
-                        print(f"✅ SMS sent to {phone_number} via NimbusIT. Response: {result}")
+                        logger.info("SMS sent to %s via NimbusIT. Response: %s", phone_number, result)
                         return True
                     else:
-                        print(f"❌ SMS API error for {phone_number}: Status {response.status}")
+                        logger.warning("SMS API error for %s: Status %s", phone_number, response.status)
                         return False
         except Exception as e:
-            print(f"❌ Error sending SMS to {phone_number}: {e}")
+            logger.warning("Error sending SMS to %s: %s", phone_number, e)
             return False
     
+    @staticmethod
+    async def check_send_rate(phone_number: str):
+        """
+        Count this OTP send against the phone's current window and raise 429 past
+        OTP_SEND_LIMIT. One upsert on `otp_send_counts` (shared by all workers; rows expire
+        via TTL index). Fails open if MongoDB is unreachable.
+        """
+        window = int(time.time()) // OTP_SEND_WINDOW_SECONDS
+        try:
+            db = await get_database()
+            counter = await db.otp_send_counts.find_one_and_update(
+                {"_id": f"{phone_number}:{window}"},
+                {
+                    "$inc": {"count": 1},
+                    "$setOnInsert": {
+                        "expires_at": datetime.utcfromtimestamp((window + 1) * OTP_SEND_WINDOW_SECONDS),
+                    },
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except Exception as e:
+            logger.warning("OTP rate limit check failed for %s: %s", phone_number, e)
+            return
+        if counter["count"] > OTP_SEND_LIMIT:
+            raise HTTPException(status_code=429, detail="Too many OTP requests. Please try again later.")
+
     @staticmethod
     async def send_otp(phone_number: str, is_login: bool = False) -> str:
         """
         Generate and send OTP to phone number via SMS.
         Returns the OTP (for internal storage/verification).
+        Raises 429 when the phone has exceeded its OTP send limit.
         """
+        if not OTPService._is_apple_review_phone(phone_number):
+            await OTPService.check_send_rate(phone_number)
+
         if OTPService._is_apple_review_phone(phone_number):
             otp = OTPService._get_apple_review_otp()
             expires_at = datetime.utcnow() + timedelta(days=OTPService._get_apple_review_ttl_days())
@@ -134,7 +229,7 @@ class OTPService:
         if not OTPService._is_apple_review_phone(phone_number):
             sms_sent = await OTPService.send_sms_via_nimbus(phone_number, otp, is_login)
             if not sms_sent:
-                print(f"⚠️ Warning: SMS sending failed for {phone_number}, but OTP generated: {otp}")
+                logger.warning("SMS sending failed for %s; OTP kept for verification", phone_number)
                 # Still store OTP so verification can work if SMS is delayed
         
         return otp
@@ -144,7 +239,7 @@ class OTPService:
         """Verify OTP for phone number"""
         # Allow a configured static OTP for the review phone even if request step
         # wasn't performed (useful for QA / review automation).
-        if OTPService._is_apple_review_phone(phone_number) and otp.strip() == OTPService._get_apple_review_otp():
+        if OTPService._is_apple_review_phone(phone_number) and OTPService._otp_matches(OTPService._get_apple_review_otp(), otp.strip()):
             otp_storage[phone_number] = {
                 "otp": OTPService._get_apple_review_otp(),
                 "expires_at": datetime.utcnow() + timedelta(days=OTPService._get_apple_review_ttl_days()),
@@ -153,14 +248,9 @@ class OTPService:
             }
             return True
 
-        if phone_number not in otp_storage:
-            return False
-        
-        otp_data = otp_storage[phone_number]
-        
-        # Check if OTP expired
-        if datetime.utcnow() > otp_data["expires_at"]:
-            del otp_storage[phone_number]
+        # Expired OTPs are already gone: otp_storage evicts each entry at its expires_at
+        otp_data = otp_storage.get(phone_number)
+        if otp_data is None:
             return False
         
         # Check attempts (max 5 attempts)
@@ -172,7 +262,7 @@ class OTPService:
         otp_data["attempts"] += 1
         
         # Verify OTP
-        if otp_data["otp"] == otp:
+        if OTPService._otp_matches(otp_data["otp"], otp):
             otp_data["verified"] = True
             return True
         
@@ -181,36 +271,39 @@ class OTPService:
     @staticmethod
     async def is_otp_verified(phone_number: str) -> bool:
         """Check if OTP is verified for phone number"""
-        if phone_number not in otp_storage:
+        otp_data = otp_storage.get(phone_number)
+        if otp_data is None:
             return False
-        return otp_storage[phone_number].get("verified", False)
+        return otp_data.get("verified", False)
     
     @staticmethod
     async def clear_otp(phone_number: str):
         """Clear OTP data after successful signup"""
-        if phone_number in otp_storage:
-            del otp_storage[phone_number]
+        otp_storage.pop(phone_number, None)
     
     @staticmethod
     async def store_otp_in_db(phone_number: str, otp: str):
         """Store OTP in MongoDB for persistence (optional)"""
         db = await get_database()
         if OTPService._is_apple_review_phone(phone_number):
-            expires_at = datetime.utcnow() + timedelta(days=OTPService._get_apple_review_ttl_days())
+            ttl = timedelta(days=OTPService._get_apple_review_ttl_days())
         else:
-            expires_at = datetime.utcnow() + timedelta(minutes=5)  # Match SMS validity
+            ttl = timedelta(minutes=5)  # Match SMS validity
         
+        # Both timestamps come from the server clock ($$NOW), the same one the TTL index uses
         await db.otps.update_one(
             {"phone_number": phone_number},
-            {
-                "$set": {
-                    "otp": otp,
-                    "expires_at": expires_at,
-                    "verified": False,
-                    "attempts": 0,
-                    "created_at": datetime.utcnow()
+            [
+                {
+                    "$set": {
+                        "otp": {"$literal": otp},
+                        "verified": False,
+                        "attempts": 0,
+                        "created_at": "$$NOW",
+                        "expires_at": {"$add": ["$$NOW", int(ttl.total_seconds() * 1000)]},
+                    }
                 }
-            },
+            ],
             upsert=True
         )
     
@@ -220,58 +313,65 @@ class OTPService:
         db = await get_database()
 
         # Allow configured static OTP for the review phone even if no OTP row exists.
-        if OTPService._is_apple_review_phone(phone_number) and otp.strip() == OTPService._get_apple_review_otp():
+        if OTPService._is_apple_review_phone(phone_number) and OTPService._otp_matches(OTPService._get_apple_review_otp(), otp.strip()):
+            ttl = timedelta(days=OTPService._get_apple_review_ttl_days())
             await db.otps.update_one(
                 {"phone_number": phone_number},
-                {
-                    "$set": {
-                        "otp": OTPService._get_apple_review_otp(),
-                        "expires_at": datetime.utcnow() + timedelta(days=OTPService._get_apple_review_ttl_days()),
-                        "verified": True,
-                        "attempts": 0,
-                        "created_at": datetime.utcnow(),
+                [
+                    {
+                        "$set": {
+                            "otp": {"$literal": OTPService._get_apple_review_otp()},
+                            "verified": True,
+                            "attempts": 0,
+                            "created_at": "$$NOW",
+                            "expires_at": {"$add": ["$$NOW", int(ttl.total_seconds() * 1000)]},
+                        }
                     }
-                },
+                ],
                 upsert=True,
             )
             return True
 
-        otp_data = await db.otps.find_one({"phone_number": phone_number})
+        # One round trip: only a live row with attempts left (max 5) matches; the pipeline
+        # update counts the attempt and sets verified when the OTP matches. Expired rows
+        # are reaped by the TTL index on expires_at; until its next pass they don't match.
+        # Expiry is checked against $$NOW, the server clock that wrote expires_at.
+        otp_data = await db.otps.find_one_and_update(
+            {
+                "phone_number": phone_number,
+                "$expr": {"$gt": ["$expires_at", "$$NOW"]},
+                "attempts": {"$not": {"$gte": 5}},
+            },
+            [
+                {
+                    "$set": {
+                        "attempts": {"$add": [{"$ifNull": ["$attempts", 0]}, 1]},
+                        "verified": {
+                            "$or": [
+                                {"$ifNull": ["$verified", False]},
+                                {"$eq": ["$otp", {"$literal": otp}]},
+                            ]
+                        },
+                    }
+                }
+            ],
+            projection={"otp": 1},
+            return_document=ReturnDocument.AFTER,
+        )
         
         if not otp_data:
             return False
         
-        # Check if expired
-        if datetime.utcnow() > otp_data["expires_at"]:
-            await db.otps.delete_one({"phone_number": phone_number})
-            return False
-        
-        # Check attempts
-        if otp_data.get("attempts", 0) >= 5:
-            await db.otps.delete_one({"phone_number": phone_number})
-            return False
-        
-        # Update attempts
-        await db.otps.update_one(
-            {"phone_number": phone_number},
-            {"$inc": {"attempts": 1}}
-        )
-        
-        # Verify OTP
-        if otp_data["otp"] == otp:
-            await db.otps.update_one(
-                {"phone_number": phone_number},
-                {"$set": {"verified": True}}
-            )
-            return True
-        
-        return False
+        return OTPService._otp_matches(otp_data["otp"], otp)
     
     @staticmethod
     async def is_otp_verified_from_db(phone_number: str) -> bool:
         """Check if OTP is verified from MongoDB"""
         db = await get_database()
-        otp_data = await db.otps.find_one({"phone_number": phone_number})
+        otp_data = await db.otps.find_one(
+            {"phone_number": phone_number, "$expr": {"$gt": ["$expires_at", "$$NOW"]}},
+            {"verified": 1},
+        )
         if not otp_data:
             return False
         return otp_data.get("verified", False)
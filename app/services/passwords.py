@@ -0,0 +1,19 @@
+"""
+Password hashing shared by user creation and the OTP signup/login flows.
+"""
+import asyncio
+import os
+
+import bcrypt
+
+# bcrypt work factor; each +1 doubles hashing time. Override with BCRYPT_ROUNDS.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+
+def _hash_sync(password: str) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+
+
+async def hash_password(password: str) -> str:
+    """bcrypt hash, computed in a worker thread so the event loop is not blocked."""
+    return await asyncio.to_thread(_hash_sync, password)
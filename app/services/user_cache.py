@@ -0,0 +1,66 @@
+"""
+Short-lived read-through cache for single-user reads (GET /api/users/{id}, /profile/{id}).
+
+Profile screens re-fetch the same user on every navigation; entries live for USER_CACHE_TTL
+seconds and are dropped by every handler that writes to a user document.
+"""
+import asyncio
+from typing import Dict, Optional
+
+from bson import ObjectId
+from cachetools import TTLCache
+
+from app.object_ids import parse_object_id
+from app.schemas import User
+
+USER_CACHE_TTL = 30
+
+# Only the fields the User response model reads (so never the password hash).
+USER_PROJECTION = {name: 1 for name in User.model_fields if name != "id"}
+
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=USER_CACHE_TTL)
+# One in-flight load per user id; removed by the task itself once it finishes.
+_inflight: Dict[str, "asyncio.Task[Optional[dict]]"] = {}
+
+
+def _cache_key(user_id) -> str:
+    # Canonical lowercase hex, so every spelling of an id reads and invalidates one entry
+    return str(parse_object_id(str(user_id), "user"))
+
+
+async def _fetch_user(db, user_id: str) -> Optional[dict]:
+    # Some older records may store `_id` as a string instead of ObjectId.
+    # Try both representations for better compatibility.
+    user = await db.users.find_one({"_id": ObjectId(user_id)}, USER_PROJECTION)
+    if not user:
+        user = await db.users.find_one({"_id": user_id}, USER_PROJECTION)
+    if user:
+        user["_id"] = str(user["_id"])
+    return user
+
+
+async def _load_user(db, user_id: str) -> Optional[dict]:
+    user = await _fetch_user(db, user_id)
+    if user:
+        _user_cache[user_id] = user
+    return user
+
+
+async def get_cached_user(db, user_id: str) -> Optional[dict]:
+    """Return the user (without password, `_id` as str) or None; concurrent misses share one query."""
+    user_id = _cache_key(user_id)
+    user = _user_cache.get(user_id)
+    if user is None:
+        task = _inflight.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(_load_user(db, user_id))
+            _inflight[user_id] = task
+            task.add_done_callback(lambda _: _inflight.pop(user_id, None))
+        # shield: a cancelled caller must not cancel the load the other callers are awaiting
+        user = await asyncio.shield(task)
+    return dict(user) if user else None
+
+
+def invalidate_user(user_id) -> None:
+    """Drop a cached user after any write to its document."""
+    _user_cache.pop(_cache_key(user_id), None)
@@ -0,0 +1,17 @@
+"""
+Case-insensitive substring filters for user-supplied search text.
+"""
+import re
+from functools import lru_cache
+
+from bson.regex import Regex
+
+
+@lru_cache(maxsize=4096)
+def contains_ci(needle: str) -> Regex:
+    """
+    Regex matching `needle` literally anywhere in a field, ignoring case.
+    The needle is escaped so input like "(a+)+$" cannot turn into a backtracking pattern;
+    results are cached so repeated searches (e.g. paging through one city) reuse the object.
+    """
+    return Regex(re.escape(needle), "i")
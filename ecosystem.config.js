@@ -2,7 +2,7 @@ module.exports = {
   apps: [{
     name: 'huntbackend',
     script: 'venv/bin/python',
-    args: '-m uvicorn main:app --host 0.0.0.0 --port 8000',
+    args: '-m uvicorn main:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools',
     cwd: '/var/backend/huntbackend',
     interpreter: 'none',
     instances: 1,
@@ -12,6 +12,8 @@ module.exports = {
     env: {
       NODE_ENV: 'production',
       PYTHONUNBUFFERED: '1'
+      // ALLOWED_ORIGINS: comma-separated web origins. Required for credentialed
+      // browser requests; the default '*' disables CORS credentials.
     },
     error_file: './logs/pm2-error.log',
     out_file: './logs/pm2-out.log',
@@ -1,8 +1,12 @@
+import asyncio
 import logging
+import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from app.routers import (
     properties,
@@ -30,24 +34,53 @@ from app.routers import (
     success_stories,
 )
 from app.database import connect_to_mongo, close_mongo_connection
+from app.services.otp_service import OTPService
 from app.upload_urls import get_uploads_directory
 
 logger = logging.getLogger(__name__)
 
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles for /uploads: files are uuid-named and never rewritten, so let clients cache them."""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=2592000, immutable"
+        return response
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Mongo connect (TLS handshake + index setup) and the SMS session open independently
+    await asyncio.gather(connect_to_mongo(), OTPService.init_session())
+    yield
+    await asyncio.gather(close_mongo_connection(), OTPService.close_session())
+
+
 app = FastAPI(
     title="Hunt Property API",
     description="Complete API for Hunt Property - Real Estate Management System",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# CORS middleware
+# CORS middleware. ALLOWED_ORIGINS: comma-separated web origins (default "*"). Credentials
+# are only allowed with an explicit list, since the spec forbids them with a wildcard.
+ALLOWED_ORIGINS = [origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "*").split(",") if origin.strip()]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
+    allow_origins=ALLOWED_ORIGINS,
+    allow_credentials="*" not in ALLOWED_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
+if "*" in ALLOWED_ORIGINS:
+    logger.warning(
+        "ALLOWED_ORIGINS is '*': CORS credentials (cookies, Authorization from browsers) are disabled; "
+        "set ALLOWED_ORIGINS to the web origins if a browser client needs them"
+    )
 
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
@@ -97,21 +130,14 @@ app.include_router(
 #     tags=["Razorpay"],
 # )
 
-# Serve uploaded images at /uploads/ (same dir as upload router; override with HUNT_UPLOADS_DIR)
+# Serve uploaded images at /uploads/ (same dir as upload router; override with HUNT_UPLOADS_DIR).
+# Set SERVE_UPLOADS_LOCAL=0 when nginx/a CDN serves /uploads/ from that directory, so the
+# API workers don't spend event-loop time streaming image files.
 uploads_dir = get_uploads_directory()
 uploads_dir.mkdir(parents=True, exist_ok=True)
-app.mount("/uploads", StaticFiles(directory=str(uploads_dir)), name="uploads")
-logger.info("Serving /uploads/ from %s", uploads_dir)
-
-
-@app.on_event("startup")
-async def startup_event():
-    await connect_to_mongo()
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    await close_mongo_connection()
+if os.getenv("SERVE_UPLOADS_LOCAL", "1") == "1":
+    app.mount("/uploads", CachedStaticFiles(directory=str(uploads_dir)), name="uploads")
+    logger.info("Serving /uploads/ from %s", uploads_dir)
 
 
 @app.get("/")
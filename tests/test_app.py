@@ -0,0 +1,50 @@
+import json
+import re
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+# Not used as a context manager, so the lifespan (MongoDB, SMS session) does not run
+client = TestClient(app)
+
+
+def test_root():
+    res = client.get("/")
+    assert res.status_code == 200
+    assert res.json()["docs"] == "/docs"
+
+
+def test_openapi_schema_builds_without_dangling_refs():
+    res = client.get("/openapi.json")
+    assert res.status_code == 200
+    schemas = res.json()["components"]["schemas"]
+    assert {"Property", "PropertyListResponse", "LocationCreate", "User"} <= schemas.keys()
+    # json_body_openapi inlines request bodies; their nested refs must still resolve
+    refs = set(re.findall(r"#/components/schemas/(\w+)", json.dumps(res.json())))
+    assert refs <= schemas.keys()
+
+
+def test_create_endpoints_reject_malformed_ids_with_400():
+    order = {"user_id": "not-an-id", "plan_id": "gold", "plan_name": "Gold", "amount": 1}
+    res = client.post("/api/orders/", json=order)
+    assert (res.status_code, res.json()) == (400, {"detail": "Invalid user ID"})
+    listing = {
+        "owner_id": "not-an-id",
+        "title": "2BHK",
+        "description": "Flat",
+        "transaction_type": "rent",
+        "price": 25000,
+        "bedrooms": 2,
+        "bathrooms": 2,
+        "area_sqft": 1100,
+        "furnishing": "furnished",
+        "location": {
+            "address": "A-1",
+            "locality": "Sector 62",
+            "city": "Noida",
+            "geo": {"type": "Point", "coordinates": [77.36, 28.62]},
+        },
+    }
+    res = client.post("/api/properties/", json=listing)
+    assert (res.status_code, res.json()) == (400, {"detail": "Invalid owner ID"})
@@ -0,0 +1,22 @@
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.object_ids import parse_object_id
+
+
+def test_parses_24_hex_digits():
+    oid = ObjectId()
+    assert parse_object_id(str(oid), "property") == oid
+    assert parse_object_id(str(oid).upper(), "property") == oid
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["", "abc", "z" * 24, "0" * 23, "0" * 26, " " + "0" * 23, "00 " + "0" * 22, None, 123],
+)
+def test_rejects_invalid_ids_with_400(value):
+    with pytest.raises(HTTPException) as exc:
+        parse_object_id(value, "property")
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Invalid property ID"
@@ -0,0 +1,55 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import otp_service
+from app.services.otp_service import OTP_SEND_LIMIT, OTPService
+
+
+class FakeSendCounts:
+    """Just enough of otp_send_counts.find_one_and_update ($inc upsert) for check_send_rate."""
+
+    def __init__(self):
+        self.rows = {}
+
+    async def find_one_and_update(self, filter, update, upsert, return_document):
+        row = self.rows.setdefault(filter["_id"], {"_id": filter["_id"], "count": 0, **update["$setOnInsert"]})
+        row["count"] += update["$inc"]["count"]
+        return dict(row)
+
+
+class FailingSendCounts:
+    async def find_one_and_update(self, *args, **kwargs):
+        raise ConnectionError("mongo down")
+
+
+def use_collection(monkeypatch, collection):
+    async def get_database():
+        return SimpleNamespace(otp_send_counts=collection)
+
+    monkeypatch.setattr(otp_service, "get_database", get_database)
+
+
+def test_sends_past_limit_get_429(monkeypatch):
+    use_collection(monkeypatch, FakeSendCounts())
+    # Pin the clock so every send lands in the same window
+    monkeypatch.setattr(otp_service.time, "time", lambda: 1_700_000_000.0)
+
+    async def run():
+        for _ in range(OTP_SEND_LIMIT):
+            await OTPService.check_send_rate("+911234567890")
+        # Limits are per phone number
+        await OTPService.check_send_rate("+919999999999")
+        with pytest.raises(HTTPException) as exc:
+            await OTPService.check_send_rate("+911234567890")
+        return exc.value
+
+    error = asyncio.run(run())
+    assert error.status_code == 429
+
+
+def test_fails_open_when_mongo_is_unreachable(monkeypatch):
+    use_collection(monkeypatch, FailingSendCounts())
+    asyncio.run(OTPService.check_send_rate("+911234567890"))
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.pagination import keyset_filter, next_cursor, page_flags
+
+AFTER = datetime(2024, 1, 2, 3, 4, 5)
+
+
+def test_keyset_filter_first_page():
+    assert keyset_filter(None, None) is None
+    assert keyset_filter(None, str(ObjectId())) is None
+
+
+def test_keyset_filter_created_at_only():
+    assert keyset_filter(AFTER, None) == {"created_at": {"$lt": AFTER}}
+
+
+def test_keyset_filter_breaks_ties_on_id():
+    oid = ObjectId()
+    assert keyset_filter(AFTER, str(oid)) == {
+        "$or": [
+            {"created_at": {"$lt": AFTER}},
+            {"created_at": AFTER, "_id": {"$lt": oid}},
+        ]
+    }
+
+
+def test_keyset_filter_rejects_bad_after_id():
+    with pytest.raises(HTTPException) as exc:
+        keyset_filter(AFTER, "not-an-id")
+    assert exc.value.status_code == 400
+
+
+def test_next_cursor_from_last_item_of_full_page():
+    oid = ObjectId()
+    items = [{"_id": ObjectId(), "created_at": datetime(2024, 1, 3)}, {"_id": oid, "created_at": AFTER}]
+    assert next_cursor(items, 2) == {"after": AFTER.isoformat(), "after_id": str(oid)}
+
+
+def test_next_cursor_none_on_last_page_or_missing_timestamp():
+    assert next_cursor([{"_id": ObjectId(), "created_at": AFTER}], 2) is None
+    assert next_cursor([], 1) is None
+    assert next_cursor([{"_id": ObjectId(), "created_at": "2024-01-02"}], 1) is None
+
+
+def test_page_flags_for_page_requests():
+    assert page_flags(1, 20, 45, None, None) == {"total_pages": 3, "has_next": True, "has_prev": False}
+    assert page_flags(3, 20, 45, None, None) == {"total_pages": 3, "has_next": False, "has_prev": True}
+    assert page_flags(1, 20, 0, None, None) == {"total_pages": 0, "has_next": False, "has_prev": False}
+
+
+def test_page_flags_for_cursor_requests_ignore_page():
+    keyset = keyset_filter(AFTER, None)
+    cursor = {"after": AFTER.isoformat(), "after_id": str(ObjectId())}
+    assert page_flags(1, 20, 45, keyset, cursor) == {"total_pages": 3, "has_next": True, "has_prev": True}
+    assert page_flags(1, 20, 45, keyset, None) == {"total_pages": 3, "has_next": False, "has_prev": True}
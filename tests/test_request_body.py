@@ -0,0 +1,45 @@
+from fastapi import Body, Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, Field
+
+from app.request_body import json_body
+
+
+class Item(BaseModel):
+    name: str = Field(..., max_length=5)
+    price: float
+
+
+app = FastAPI()
+
+
+@app.post("/fast")
+async def fast(item: Item = Depends(json_body(Item))):
+    return item
+
+
+@app.post("/stock")
+async def stock(item: Item = Body(...)):
+    return item
+
+
+client = TestClient(app)
+
+
+def test_valid_body_is_parsed():
+    assert client.post("/fast", json={"name": "pen", "price": 2}).json() == {"name": "pen", "price": 2.0}
+
+
+def test_invalid_body_returns_fastapi_422_shape():
+    payload = {"name": "too long", "price": "free"}
+    fast_res = client.post("/fast", json=payload)
+    stock_res = client.post("/stock", json=payload)
+    assert fast_res.status_code == stock_res.status_code == 422
+    assert fast_res.json() == stock_res.json()
+    assert [err["loc"] for err in fast_res.json()["detail"]] == [["body", "name"], ["body", "price"]]
+
+
+def test_malformed_json_returns_422():
+    res = client.post("/fast", content=b"{not json", headers={"content-type": "application/json"})
+    assert res.status_code == 422
+    assert res.json()["detail"][0]["loc"][0] == "body"
@@ -0,0 +1,162 @@
+from datetime import datetime
+from typing import get_args
+
+import pytest
+from bson import ObjectId
+from pydantic import TypeAdapter, ValidationError
+
+from app.schemas import (
+    Inquiry,
+    InquiryUpdate,
+    LocationCreate,
+    NotificationCreate,
+    NotificationType,
+    PLAN_TYPES,
+    PROPERTY_ALERT_TYPES,
+    PagedResponse,
+    PropertyCreate,
+    PropertyListResponse,
+    Transaction,
+    User,
+    UserCreate,
+    validate_property_list,
+)
+
+# A stored listing from before the enum/bounds/length validation on the input models
+LEGACY_PROPERTY = {
+    "_id": ObjectId(),
+    "owner_id": ObjectId(),
+    "title": "T" * 300,
+    "description": "Old listing",
+    "transaction_type": "lease",
+    "price": -5,
+    "bedrooms": 99,
+    "bathrooms": 1,
+    "area_sqft": 900,
+    "furnishing": "Semi Furnished",
+    "facing": "north",
+    "location": {
+        "address": "A" * 600,
+        "locality": "Sector 62",
+        "city": "Noida",
+        "geo": {"type": "Point", "coordinates": [77.36, 28.62]},
+    },
+    "images": [{"url": "/uploads/a.png"}],
+    "posted_at": datetime(2023, 5, 1),
+}
+
+
+@pytest.mark.parametrize(
+    "total, page, limit, total_pages, has_next, has_prev",
+    [
+        (0, 1, 20, 0, False, False),
+        (20, 1, 20, 1, False, False),
+        (21, 1, 20, 2, True, False),
+        (21, 2, 20, 2, False, True),
+        (45, 2, 20, 3, True, True),
+    ],
+)
+def test_paged_response_computed_fields(total, page, limit, total_pages, has_next, has_prev):
+    paged = PagedResponse(total=total, page=page, limit=limit)
+    assert (paged.total_pages, paged.has_next, paged.has_prev) == (total_pages, has_next, has_prev)
+
+
+def test_list_responses_serialize_paging_fields():
+    body = PropertyListResponse(properties=[], total=45, page=2, limit=20).model_dump(mode="json")
+    assert body == {
+        "properties": [],
+        "total": 45,
+        "page": 2,
+        "limit": 20,
+        "total_pages": 3,
+        "has_next": True,
+        "has_prev": True,
+    }
+
+
+def test_legacy_property_document_validates_as_response():
+    [prop] = validate_property_list([LEGACY_PROPERTY])
+    assert prop.transaction_type == "lease"
+    assert prop.price == -5
+    assert str(prop.id) == str(LEGACY_PROPERTY["_id"])
+
+
+@pytest.mark.parametrize(
+    "geo",
+    [
+        {},
+        {"type": "Point", "coordinates": [77.36, 28.62], "crs": "EPSG:4326"},
+        {"type": "Point", "coordinates": [77.36, 28.62, 0]},
+        {"type": "Point", "coordinates": [28.62, 277.36]},
+    ],
+)
+def test_off_shape_stored_geo_does_not_fail_the_page(geo):
+    doc = {**LEGACY_PROPERTY, "location": {**LEGACY_PROPERTY["location"], "geo": geo}}
+    body = PropertyListResponse(properties=[doc], total=1, page=1, limit=20).model_dump(mode="json")
+    assert body["properties"][0]["location"]["geo"] == geo
+
+
+@pytest.mark.parametrize("coordinates", [[181, 0], [0, -91], [1, 2, 3]])
+def test_location_create_rejects_bad_points(coordinates):
+    location = {**LEGACY_PROPERTY["location"], "address": "A", "geo": {"type": "Point", "coordinates": coordinates}}
+    with pytest.raises(ValidationError):
+        TypeAdapter(LocationCreate).validate_python(location)
+
+
+def test_property_create_still_enforces_enums_and_bounds():
+    payload = {k: v for k, v in LEGACY_PROPERTY.items() if k not in ("_id", "posted_at")}
+    payload["owner_id"] = str(LEGACY_PROPERTY["owner_id"])
+    with pytest.raises(ValidationError) as exc:
+        PropertyCreate.model_validate(payload)
+    failed = {err["loc"][0] for err in exc.value.errors()}
+    assert {"title", "transaction_type", "price", "bedrooms", "furnishing", "facing", "location"} <= failed
+
+
+def test_legacy_user_inquiry_and_transaction_documents_validate():
+    user = User.model_validate(
+        {"_id": ObjectId(), "name": "A", "email": "not-an-email", "user_type": "admin", "created_at": datetime(2022, 1, 1)}
+    )
+    assert user.user_type == "admin"
+    inquiry = Inquiry.model_validate(
+        {
+            "_id": ObjectId(),
+            "property_id": "p",
+            "user_id": "u",
+            "message": "M" * 3000,
+            "contact_preference": "whatsapp",
+            "status": "completed",
+            "created_at": datetime(2022, 1, 1),
+        }
+    )
+    assert inquiry.status == "completed"
+    transaction = Transaction.model_validate(
+        {
+            "_id": ObjectId(),
+            "property_id": "p",
+            "buyer_id": "b",
+            "seller_id": "s",
+            "transaction_type": "lease",
+            "amount": -1,
+            "status": "refunded",
+            "created_at": datetime(2022, 1, 1),
+        }
+    )
+    assert transaction.status == "refunded"
+
+
+def test_input_models_reject_unknown_enum_values():
+    with pytest.raises(ValidationError):
+        UserCreate(name="A", email="a@example.com", user_type="admin", password="x")
+    with pytest.raises(ValidationError):
+        InquiryUpdate(status="archived")
+    assert InquiryUpdate(status="completed").status == "completed"
+
+
+def test_notification_tab_types_are_notification_types():
+    types = set(get_args(NotificationType))
+    assert set(PROPERTY_ALERT_TYPES) <= types
+    assert set(PLAN_TYPES) <= types
+    assert not set(PROPERTY_ALERT_TYPES) & set(PLAN_TYPES)
+    assert NotificationCreate(user_id="u", type="plan_expiring", title="t", body="b").type == "plan_expiring"
+    with pytest.raises(ValidationError):
+        NotificationCreate(user_id="u", type="promo", title="t", body="b")
@@ -0,0 +1,29 @@
+import asyncio
+
+from bson import ObjectId
+
+from app.services import user_cache
+
+
+def test_mixed_case_ids_share_one_entry_that_writes_invalidate(monkeypatch):
+    oid = ObjectId()
+    fetched = []
+
+    async def fetch_user(db, user_id):
+        fetched.append(user_id)
+        return {"_id": user_id, "name": f"v{len(fetched)}"}
+
+    monkeypatch.setattr(user_cache, "_fetch_user", fetch_user)
+
+    async def run():
+        first = await user_cache.get_cached_user(None, str(oid).upper())
+        second = await user_cache.get_cached_user(None, str(oid))
+        user_cache.invalidate_user(oid)
+        third = await user_cache.get_cached_user(None, str(oid).upper())
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first["name"] == second["name"] == "v1"
+    assert third["name"] == "v2"
+    assert fetched == [str(oid), str(oid)]
+    user_cache.invalidate_user(oid)